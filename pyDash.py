@@ -3,6 +3,24 @@ pyDash.py - Waits for sim to launch and then starts appropriate Dash app
 by Dan Allongo (daniel.s.allongo@gmail.com)
 
 Release History:
+2026-10-19: Add optional local HTTP metrics endpoint
+	Logging moved to buffered background writer with rotation and repeat suppression
+	Sim detection only looks up new PIDs and waits for sim exit on a watcher thread
+	Lock file instance check, game modules imported only when their sim is found
+	Add settings for telemetry sample rate and display render rate
+	Info text page order can be set in settings
+	Add settings for tire temperature monitor
+	Add fuel strategy margin setting and fuel info page
+	Add settings for SRD-9c button actions
+	Report SRD-9c connection state in metrics
+	Add shift light prediction and RPM smoothing settings
+	Add setting for learning RPM profiles per car
+	Optional local telemetry bus for other tools
+	Option to sample shared memory in a separate process
+	Sim watch runs as an event loop task, option to write to the SRD-9c on a separate thread
+	Add black box settings
+	Add per-lap statistics settings
+	Add telemetry recording settings
 2016-06-26: Add support for Formula Truck and Copa Petrobras de Marcas
 2016-05-30: Add multiple instance detection
 2016-05-29: Add timestamp to each log message
@@ -18,16 +36,22 @@ APP_AUTHOR = 'Dan Allongo (daniel.s.allongo@gmail.com)'
 APP_URL = 'https://github.com/dallongo/pySRD9c'
 
 if __name__ == '__main__':
-	from pyDashR3E import pyDashR3E
-	from pyDashRF1 import pyDashRF1
+	# reader process support for frozen builds (see pyDashSplit)
+	from multiprocessing import freeze_support
+	freeze_support()
 	from pySRD9c import srd9c
+	from pyDashMetrics import dashMetrics
+	from pyDashLog import dashLog
+	from pyDashBus import telemetryRing, dashFrame
+	from pyDashLoop import eventLoop, latestWorker
 
 	from time import sleep
-	from psutil import process_iter, Process
+	from pyDashProc import procWatch, instance_lock
+	from pyDashInfo import info_pages, demand_pages
 	from sys import exit
 	from distutils.util import strtobool
 	import json
-	from datetime import datetime
+	from traceback import format_exc
 
 	print "{0} v.{1}".format(APP_NAME, APP_VER)
 	print APP_DESC
@@ -35,30 +59,14 @@ if __name__ == '__main__':
 	print APP_URL
 
 	# only one instance running at a time to avoid race condition
-	pid = None
-	for p in process_iter():
-		# compiled exe with pyinstaller runs as child process during unpacking
-		if(p.pid in [Process().pid, Process().ppid()]):
-			continue
-		try:
-			if(p.cmdline() == Process().cmdline()):
-				pid = p.pid
-				break
-		except:
-			pass
-	if(pid):
+	# (compiled exe with pyinstaller runs as child process during unpacking, only the child takes the lock)
+	instance, pid = instance_lock(APP_NAME + '.lock')
+	if(not instance):
 		print "\nERROR: Instance in PID {0} already running, exiting!".format(pid)
 		sleep(3)
 		exit(1)
-	# super basic logging func, echos to console
-	def log_print(s, lfn=APP_NAME + '.log'):
-		with open(lfn, 'a+') as lfh:
-			# append timestamp to start of each log message
-			s = '\t'.join([datetime.now().strftime('%Y-%m-%d %H:%M:%S'), s])
-			print s
-			if(not s or s[-1] != '\n'):
-				s += '\n'
-			lfh.write(s)
+	# buffered logging, echos to console from the writer thread
+	log_print = dashLog(APP_NAME + '.log').log_print
 	# get and validate settings from json, write back out to disk
 	def read_settings(sfn=APP_NAME + '.settings.json'):
 		# verify options are valid
@@ -110,8 +118,9 @@ if __name__ == '__main__':
 					'_comment':"show laps/time remaining at the beginning of each lap",
 					'enabled':True
 				},
-				'_comment':"session timing info for each sector/lap. values 1.0-5.0",
-				'duration':3
+				'_comment':"session timing info for each sector/lap. values 1.0-5.0. 'pages' sets the order of the pages shown at the start of each lap, options are 'lap_split', 'position', 'remaining', 'tires', 'fuel'",
+				'duration':3,
+				'pages':['lap_split', 'position', 'remaining']
 			},
 			'drs_ptp':{
 				'_comment':"(R3E only) text and green RPM LEDs for DRS/PTP",
@@ -127,8 +136,9 @@ if __name__ == '__main__':
 				'units':"mph"
 			},
 			'fuel':{
-				'_comment':"tune fuel warnings. 'samples' is how many laps to use for the moving average of fuel use (values 1.0-5.0). 'warning' is how many laps of fuel left to turn on LED (values 2.0-5.0). 'critical' is how many laps of fuel left to blink LED (values 0.5-2.0).",
+				'_comment':"tune fuel warnings. 'samples' is how many laps to use for the moving average of fuel use (values 1.0-5.0). 'warning' is how many laps of fuel left to turn on LED (values 2.0-5.0). 'critical' is how many laps of fuel left to blink LED (values 0.5-2.0). 'margin' is how many extra laps of fuel to include in fuel to add on the 'fuel' info page (values 0.0-3.0).",
 				'warning':3,
+				'margin':0.5,
 				'critical':1,
 				'samples':3,
 				'enabled':True
@@ -140,10 +150,67 @@ if __name__ == '__main__':
 				'samples':3,
 				'enabled':True
 			},
+			'tires':{
+				'_comment':"tune tire temperature warnings. 'rate' is how many times per second tires are checked (values 1.0-10.0). 'baseline' is how many seconds to learn normal temperatures once the tires are warm, after the first lap or when temperatures level off (values 30-600). 'warning' is how many degrees C from baseline to turn on yellow LED (values 5.0-30.0). 'critical' is how many degrees C from baseline to blink it (values 10.0-40.0). 'spread' is how many degrees C between the inner and outer tread to turn on yellow LED, blinks at twice that (values 5.0-30.0). 'pressure' is how many kPa from baseline to turn on yellow LED, blinks at twice that (values 2.0-50.0).",
+				'rate':2,
+				'baseline':120,
+				'warning':10,
+				'critical':20,
+				'spread':15,
+				'pressure':10,
+				'enabled':True
+			},
+			'buttons':{
+				'_comment':"SRD-9c button numbers (values 0-63) for 'page' (show the next of 'pages', options are 'position', 'remaining', 'tires', 'fuel') and 'ack' (silence warning text for 'ack_time' seconds, values 5-300)",
+				'page':0,
+				'ack':1,
+				'ack_time':30,
+				'pages':['fuel', 'tires', 'position', 'remaining']
+			},
 			'rpm':{
-				'_comment':"change tach/shift points. 'range' is what fraction of the RPM range is represented by each group of 4 LEDs (values 0.05-0.33). 'shift' is what fraction of the RPM range to trigger the shift LED (values 0.85-1.0).",
+				'_comment':"change tach/shift points. 'range' is what fraction of the RPM range is represented by each group of 4 LEDs (values 0.05-0.33). 'shift' is what fraction of the RPM range to trigger the shift LED (values 0.85-1.0). 'predict' lights the shift LED early by the time it takes to reach the display. 'latency' is how many seconds the display itself adds to that (values 0.0-0.1). 'smoothing' is how much to smooth the RPM LEDs (values 0.0-0.9, 0 is off). 'learn' uses the limiter and gearing learned for each car model once it has been driven (off by default), 'shift' is then a fraction of the learned limiter and the LEDs start where the RPM lands after the shift.",
 				'range':0.13,
-				'shift':0.95
+				'shift':0.95,
+				'predict':True,
+				'latency':0.01,
+				'smoothing':0.0,
+				'learn':False
+			},
+			'timing':{
+				'_comment':"'sample_rate' is how many times per second telemetry is read (values 20-500). 'render_rate' is how many times per second the display is updated (values 10-200). 'spin' is how many seconds before each deadline to busy-wait instead of sleep for steadier timing at the cost of CPU, 0 only sleeps (values 0.0-0.005, about 0.0005 is enough with 1 ms timer resolution). 'split' samples the sim in a separate process so the display and logging cannot hold up sampling (read when the sim starts). 'hid_thread' writes to the SRD-9c on a separate thread (read at start-up only).",
+				'sample_rate':100,
+				'render_rate':60,
+				'spin':0,
+				'split':False,
+				'hid_thread':True
+			},
+			'metrics':{
+				'_comment':"serve loop rate, latency and counters as JSON on http://localhost:<port>/ (read at start-up only). 'remote' allows other machines to connect. 'port' values 1024-65535.",
+				'enabled':False,
+				'port':8089,
+				'remote':False
+			},
+			'bus':{
+				'_comment':"republish telemetry to other tools through the shared memory block 'name' (read at start-up only). 'slots' is how many frames are kept (values 4-1024).",
+				'enabled':False,
+				'name':'pyDashBus',
+				'slots':64
+			},
+			'blackbox':{
+				'_comment':"keep the last 'seconds' of telemetry (values 10-600) in memory at 'rate' frames per second (values 1-100), written to disk on critical warnings and errors.",
+				'enabled':True,
+				'seconds':60,
+				'rate':20
+			},
+			'laps':{
+				'_comment':"log speed, RPM, throttle, brake and temperature statistics at the end of each lap. 'store' also appends them to pyDash.laps.json.",
+				'enabled':True,
+				'store':True
+			},
+			'record':{
+				'_comment':"record the sim shared memory at 'rate' frames per second (values 1-100) to pyDash.<sim>.<date>-<time>.rec with an index of laps, sectors and pit stops (large files, roughly 1 GB per hour at 10 frames per second).",
+				'enabled':False,
+				'rate':10
 			}
 		}
 		# get settings from json
@@ -169,6 +236,11 @@ if __name__ == '__main__':
 				settings['info_text']['position']['enabled'] = check_option(settings['info_text']['position']['enabled'], 'bool', defaults['info_text']['position']['enabled'])
 				settings['info_text']['remaining']['enabled'] = check_option(settings['info_text']['remaining']['enabled'], 'bool', defaults['info_text']['remaining']['enabled'])
 				settings['info_text']['duration'] = check_option(settings['info_text']['duration'], 'float', defaults['info_text']['duration'], [1, 5])
+				pages = settings['info_text'].get('pages', defaults['info_text']['pages'])
+				if(not isinstance(pages, list)):
+					pages = [pages]
+				pages = [p for p in [check_option(p, 'str', None, info_pages) for p in pages] if p]
+				settings['info_text']['pages'] = pages or defaults['info_text']['pages']
 
 				settings['neutral']['symbol'] = check_option(settings['neutral']['symbol'], 'str', defaults['neutral']['symbol'], ['0', 'n', '-', '_', ' '])
 				settings['speed']['units'] = check_option(settings['speed']['units'], 'str', defaults['speed']['units'], ['mph', 'km/h'])
@@ -180,45 +252,120 @@ if __name__ == '__main__':
 				settings['fuel']['samples'] = check_option(settings['fuel']['samples'], 'float', defaults['fuel']['samples'], [1, 5])
 				settings['fuel']['warning'] = check_option(settings['fuel']['warning'], 'float', defaults['fuel']['warning'], [2, 5])
 				settings['fuel']['critical'] = check_option(settings['fuel']['critical'], 'float', defaults['fuel']['critical'], [0.5, 2])
+				settings['fuel']['margin'] = check_option(settings['fuel'].get('margin'), 'float', defaults['fuel']['margin'], [0, 3])
 
 				settings['temperature']['enabled'] = check_option(settings['temperature']['enabled'], 'bool', defaults['temperature']['enabled'])
 				settings['temperature']['samples'] = check_option(settings['temperature']['samples'], 'float', defaults['temperature']['samples'], [1, 5])
 				settings['temperature']['warning'] = check_option(settings['temperature']['warning'], 'float', defaults['temperature']['warning'], [2, 10])
 				settings['temperature']['critical'] = check_option(settings['temperature']['critical'], 'float', defaults['temperature']['critical'], [10, 20])
 
+				settings['tires']['enabled'] = check_option(settings['tires']['enabled'], 'bool', defaults['tires']['enabled'])
+				settings['tires']['rate'] = check_option(settings['tires']['rate'], 'float', defaults['tires']['rate'], [1, 10])
+				settings['tires']['baseline'] = check_option(settings['tires']['baseline'], 'float', defaults['tires']['baseline'], [30, 600])
+				settings['tires']['warning'] = check_option(settings['tires']['warning'], 'float', defaults['tires']['warning'], [5, 30])
+				settings['tires']['critical'] = check_option(settings['tires']['critical'], 'float', defaults['tires']['critical'], [10, 40])
+				settings['tires']['spread'] = check_option(settings['tires'].get('spread'), 'float', defaults['tires']['spread'], [5, 30])
+				settings['tires']['pressure'] = check_option(settings['tires'].get('pressure'), 'float', defaults['tires']['pressure'], [2, 50])
+
+				settings['buttons']['page'] = int(check_option(settings['buttons']['page'], 'float', defaults['buttons']['page'], [0, 63]))
+				settings['buttons']['ack'] = int(check_option(settings['buttons']['ack'], 'float', defaults['buttons']['ack'], [0, 63]))
+				settings['buttons']['ack_time'] = check_option(settings['buttons']['ack_time'], 'float', defaults['buttons']['ack_time'], [5, 300])
+				pages = settings['buttons']['pages']
+				if(not isinstance(pages, list)):
+					pages = [pages]
+				pages = [p for p in [check_option(p, 'str', None, demand_pages) for p in pages] if p]
+				settings['buttons']['pages'] = pages or defaults['buttons']['pages']
+
 				settings['rpm']['range'] = check_option(settings['rpm']['range'], 'float', defaults['rpm']['range'], [0.05, 0.33])
 				settings['rpm']['shift'] = check_option(settings['rpm']['shift'], 'float', defaults['rpm']['shift'], [0.85, 1.0])
+				settings['rpm']['predict'] = check_option(settings['rpm'].get('predict'), 'bool', defaults['rpm']['predict'])
+				settings['rpm']['latency'] = check_option(settings['rpm'].get('latency'), 'float', defaults['rpm']['latency'], [0, 0.1])
+				settings['rpm']['smoothing'] = check_option(settings['rpm'].get('smoothing'), 'float', defaults['rpm']['smoothing'], [0, 0.9])
+				settings['rpm']['learn'] = check_option(settings['rpm'].get('learn'), 'bool', defaults['rpm']['learn'])
+
+				settings['timing']['sample_rate'] = check_option(settings['timing']['sample_rate'], 'float', defaults['timing']['sample_rate'], [20, 500])
+				settings['timing']['render_rate'] = check_option(settings['timing']['render_rate'], 'float', defaults['timing']['render_rate'], [10, 200])
+				settings['timing']['spin'] = check_option(settings['timing']['spin'], 'float', defaults['timing']['spin'], [0, 0.005])
+				settings['timing']['split'] = check_option(settings['timing'].get('split'), 'bool', defaults['timing']['split'])
+				settings['timing']['hid_thread'] = check_option(settings['timing'].get('hid_thread'), 'bool', defaults['timing']['hid_thread'])
+
+				settings['metrics']['enabled'] = check_option(settings['metrics']['enabled'], 'bool', defaults['metrics']['enabled'])
+				settings['metrics']['port'] = int(check_option(settings['metrics']['port'], 'float', defaults['metrics']['port'], [1024, 65535]))
+				settings['metrics']['remote'] = check_option(settings['metrics']['remote'], 'bool', defaults['metrics']['remote'])
+
+				settings['bus']['enabled'] = check_option(settings['bus']['enabled'], 'bool', defaults['bus']['enabled'])
+				settings['bus']['name'] = str(settings['bus']['name']) or defaults['bus']['name']
+				settings['bus']['slots'] = int(check_option(settings['bus']['slots'], 'float', defaults['bus']['slots'], [4, 1024]))
+
+				settings['blackbox']['enabled'] = check_option(settings['blackbox']['enabled'], 'bool', defaults['blackbox']['enabled'])
+				settings['blackbox']['seconds'] = check_option(settings['blackbox']['seconds'], 'float', defaults['blackbox']['seconds'], [10, 600])
+				settings['blackbox']['rate'] = check_option(settings['blackbox']['rate'], 'float', defaults['blackbox']['rate'], [1, 100])
+
+				settings['laps']['enabled'] = check_option(settings['laps']['enabled'], 'bool', defaults['laps']['enabled'])
+				settings['laps']['store'] = check_option(settings['laps']['store'], 'bool', defaults['laps']['store'])
+
+				settings['record']['enabled'] = check_option(settings['record']['enabled'], 'bool', defaults['record']['enabled'])
+				settings['record']['rate'] = check_option(settings['record']['rate'], 'float', defaults['record']['rate'], [1, 100])
 		# write out validated settings
 		with open(sfn, 'w') as f:
 			json.dump(settings, f, indent=4, separators=(',',': '), sort_keys=True)
 		return settings, sfn
 	log_print("-"*16 + " pyDash INIT " + "-"*16)
 	settings, settings_fn = read_settings()
+	metrics = dashMetrics()
+	if(settings['metrics']['enabled']):
+		try:
+			log_print("Serving metrics on http://{0}:{1}/".format(*metrics.serve(settings['metrics']['port'], settings['metrics']['remote'])))
+		except:
+			log_print("Unable to start metrics server")
+			log_print(format_exc())
+	bus = None
+	if(settings['bus']['enabled']):
+		try:
+			bus = telemetryRing(settings['bus']['name'], dashFrame, settings['bus']['slots'], writer=True)
+			log_print("Publishing telemetry to {0}".format(settings['bus']['name']))
+		except:
+			log_print("Unable to create telemetry bus")
+			log_print(format_exc())
 	log_print("Waiting for SRD-9c...")
 	dash = srd9c()
 	log_print("Connected!")
-	while(True):
-		sleep(1)
+	if(settings['timing']['hid_thread']):
+		dash.sender = latestWorker('srd9c-write', metrics)
+		dash.metrics = metrics
+	metrics.set('segment_cache', dash.cache.stats)
+	# connection state, write errors and reconnects, the display is re-acquired in the background
+	metrics.set('srd9c', dash.stats)
+	# game modules and their shared memory structures are imported when the sim is found
+	games = {'rrre.exe':'pyDashR3E', 'gsc.exe':'pyDashRF1', 'ams.exe':'pyDashRF1', 
+		'rfactor.exe':'pyDashRF1', 'ftruck.exe':'pyDashRF1', 'marcas.exe':'pyDashRF1'}
+	watch = procWatch(games.keys())
+	# one event loop for the background tasks, the game loops keep running it while the sim is up
+	tasks = eventLoop(log_print, metrics)
+	def find_sim():
 		try:
-			for p in process_iter():
-				if(p.name().lower() in ['rrre.exe', 'gsc.exe', 'ams.exe', 'rfactor.exe', 'ftruck.exe', 'marcas.exe']):
-					log_print("Found {0}".format(p.name()))
-					if(p.name().lower() == 'rrre.exe'):
-						pyDashR3E(p.pid, log_print, read_settings, dash)
-					else:
-						pyDashRF1(p.pid, log_print, read_settings, dash)
-					# clear display after exiting sim
-					dash.gear = ' '
-					dash.left = ' '*4
-					dash.right = ' '*4
-					dash.rpm['value'] = 0
-					dash.rpm['green'] = '0'*4
-					dash.rpm['red'] = '0'*4
-					dash.rpm['blue'] = '0'*4
-					dash.status = '0'*4
-					dash.update()
-					break
+			sim = watch.find()
+			if(sim):
+				log_print("Found {0}".format(sim.name))
+				metrics.set('sim', sim.name)
+				game = games[sim.name.lower()]
+				getattr(__import__(game), game)(sim, log_print, read_settings, dash, metrics, bus, tasks)
+				metrics.set('sim', None)
+				metrics.set('session', None)
+				# clear display after exiting sim
+				dash.gear = ' '
+				dash.left = ' '*4
+				dash.right = ' '*4
+				dash.rpm['value'] = 0
+				dash.rpm['green'] = '0'*4
+				dash.rpm['red'] = '0'*4
+				dash.rpm['blue'] = '0'*4
+				dash.status = '0'*4
+				dash.update()
 		except:
 			log_print("Unhandled exception!")
 			log_print(format_exc())
+		return
+	tasks.every(1.0, find_sim, 1.0)
+	tasks.run()
 	log_print("-"*16 + " pyDash SHUTDOWN " + "-"*16)
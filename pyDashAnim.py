@@ -0,0 +1,80 @@
+"""
+pyDashAnim.py - Keyframe timelines for blinking LEDs and text on the SRD-9c
+by Dan Allongo (daniel.s.allongo@gmail.com)
+
+Each effect is compiled once from the settings into a looping timeline of
+(duration, value) keyframes, where the values are already in the form the
+srd9c class expects ('0'/'1' LED strings, display text). tick() evaluates
+every timeline against the single frame timestamp from the scheduler, so
+the game loops only look up the result (ie, anim['led']).
+
+Stepped effects driven by a value rather than time (PTP charging and
+depleting) are pre-built lookup tables indexed by whole seconds left.
+
+Release History:
+2026-10-19: Initial release
+	Warning text can be muted after acknowledging with a button
+"""
+
+from bisect import bisect_right
+
+class timeline:
+	def __init__(self, keyframes):
+		self.values = [v for d, v in keyframes]
+		self.ends = []
+		t = 0
+		for d, v in keyframes:
+			t += d
+			self.ends.append(t)
+		self.period = t
+
+	def at(self, t):
+		if(len(self.values) == 1):
+			return self.values[0]
+		return self.values[min(bisect_right(self.ends, t % self.period), len(self.values) - 1)]
+
+# two phase blink, 'on' for the first half of the period (constant 'off' when disabled)
+def blink(duration, on, off, enabled=True):
+	if(not enabled):
+		return timeline([(1, off)])
+	return timeline([(duration, on), (duration, off)])
+
+class dashAnim:
+	# green RPM LEDs indexed by int(seconds left), 4 seconds and under
+	ptp_charging = ('1111', '1110', '1100', '1000', '0000')
+	ptp_depleting = ('0000', '0001', '0011', '0111', '1111')
+
+	def __init__(self, settings):
+		self.state = {}
+		self.mute_until = 0
+		self.compile(settings)
+
+	def compile(self, settings):
+		led = settings['led_blink']
+		text = settings['text_blink']
+		self.timelines = {
+			# status LEDs go dark during the first half of the blink
+			'led':blink(led['duration'], '0', '1', led['enabled']),
+			# warning text replaces the normal display during the first half
+			'text':blink(text['duration'], True, False, text['enabled']),
+			'ptp_text':blink(text['duration'], True, False, settings['drs_ptp']['text']),
+			# green RPM LEDs during PTP cool-down and while DRS/PTP is engaged
+			'ptp_wait':blink(led['duration'], '0100', '1000', led['enabled']),
+			'ptp_engaged':blink(led['duration'], '0110', '1001', led['enabled'])
+		}
+		return
+
+	def tick(self, now):
+		for k, tl in self.timelines.items():
+			self.state[k] = tl.at(now)
+		# warnings acknowledged, LEDs keep blinking but the text stays quiet
+		if(now < self.mute_until):
+			self.state['text'] = False
+		return
+
+	def mute(self, until):
+		self.mute_until = until
+		return
+
+	def __getitem__(self, k):
+		return self.state[k]
@@ -0,0 +1,182 @@
+"""
+pyDashBatch.py - Offline analysis of a directory of pyDash recordings
+by Dan Allongo (daniel.s.allongo@gmail.com)
+
+Usage: pyDashBatch.py <directory> [processes]
+
+Every .rec file in the directory (session recordings and black box dumps,
+see pyDashRec) is handed to a pool of worker processes, one file per task.
+Each worker streams the frames out of the memory-mapped file, decodes
+just the channels it needs with a generated decoder (see pyDashCodec),
+normalizes them (see pyDashBus) and runs the same logic as the game loops: per-lap
+channel statistics (pyDashLaps), fuel use averaging (pyDashFuel), the tire
+temperature baseline (pyDashTires) and sector splits. Per-lap results are
+merged into one table, printed and written as one JSON object per line to
+pyDash.batch.json in the directory.
+
+Settings for the fuel, tires and laps sections are read from
+pyDash.settings.json when it is found next to the recordings or in the
+current directory, the decoders are cached next to it. Sector splits are only as accurate as the recording
+rate (settings['record']['rate']).
+
+Release History:
+2026-10-19: Initial release
+"""
+
+from multiprocessing import Pool, cpu_count, freeze_support
+from os import listdir
+from os.path import join, basename, exists
+from traceback import format_exc
+import json
+from pyDashRec import recordingReader, stamp
+from pyDashBus import dashFrame, r3e_channels, r3e_array, r3e_player_channels, r3e_cars, r3e_player, r3e_values
+from pyDashBus import rf1_channels, rf1_array, rf1_player_channels, rf1_cars, rf1_player, rf1_values
+from pyDashCodec import load
+from pyDashLaps import lapStats
+from pyDashFuel import fuelStrategy
+from pyDashTires import tireMonitor
+
+# same as the pyDash defaults, lap summaries are merged here rather than stored per lap
+defaults = {'fuel':{'warning':3, 'margin':0.5, 'critical':1, 'samples':3, 'enabled':True},
+	'tires':{'rate':2, 'baseline':120, 'warning':10, 'critical':20, 'spread':15, 'pressure':10, 'enabled':True},
+	'laps':{'enabled':True, 'store':False}}
+
+# recorded structure -> (channels, driver array, player channels, car count, player test, frame normalizer), dashFrame recordings are already normalized
+normalizers = {'r3e_shared':(r3e_channels, r3e_array, r3e_player_channels, r3e_cars, r3e_player, r3e_values),
+	'rfShared':(rf1_channels, rf1_array, rf1_player_channels, rf1_cars, rf1_player, rf1_values)}
+
+# (time, channels, player channels) for frames where the player is found
+def decoded(rec, channels, array, player_channels, cars, player, cache):
+	codec = load(rec.frame_type, channels, cache)
+	player_codec = load(rec.frame_type, player_channels, cache, array)
+	m = rec.map
+	n = 0
+	for i in xrange(len(rec)):
+		o = rec.offset(i)
+		d = codec.decode(m, o + stamp.size)
+		dd = player_codec.decode(m, o + stamp.size, n)
+		if(n >= cars(d) or not player(d, dd)):
+			# the player's entry only moves when cars join or leave, search the others then
+			for j in xrange(cars(d)):
+				dd = player_codec.decode(m, o + stamp.size, j)
+				if(player(d, dd)):
+					n = j
+					break
+			else:
+				continue
+		yield stamp.unpack_from(m, o)[0], d, dd
+	return
+
+# returns the settings and the decoder cache next to the settings file
+def load_settings(path):
+	settings = {k:dict(v) for k, v in defaults.items()}
+	found = 'pyDash.settings.json'
+	for sfn in [join(path, 'pyDash.settings.json'), 'pyDash.settings.json']:
+		if(exists(sfn)):
+			found = sfn
+			try:
+				with open(sfn, 'r') as f:
+					s = json.load(f)
+				for k in ['fuel', 'tires']:
+					settings[k].update(s.get(k, {}))
+			except ValueError:
+				pass
+			break
+	return settings, found.replace('.settings.json', '.codec')
+
+def analyse(args):
+	fn, settings, cache = args
+	try:
+		return analyse_file(fn, settings, cache)
+	except:
+		return {'file':basename(fn), 'error':format_exc(), 'laps':[]}
+
+def analyse_file(fn, settings, cache):
+	rec = recordingReader(fn)
+	laps = lapStats(None, settings)
+	fuel = fuelStrategy(settings)
+	tires = tireMonitor(settings)
+	normalizer = normalizers.get(rec.header['struct'])
+	f = dashFrame()
+	results = []
+	sector = None
+	sector_start = None
+	splits = [None]*3
+	frames = 0
+	if(normalizer):
+		normalize = normalizer[-1]
+		source = ((t, normalize(d, dd, f)) for t, d, dd in decoded(rec, *(normalizer[:-1] + (cache,))))
+	else:
+		source = rec.frames()
+	for t, f in source:
+		f.time = t
+		frames += 1
+		if(tires.due(t)):
+			tires.update(t, list(f.tire_temps), list(f.tire_pressure), f.completed_laps)
+		if(f.sector != sector):
+			# only splits with both ends seen in this recording
+			if(sector is not None and sector_start is not None and 1 <= sector <= 3):
+				splits[sector - 1] = round(t - sector_start, 3)
+			sector_start = t if sector is not None else None
+			sector = f.sector
+			if(settings['fuel']['enabled']):
+				fuel.sector(f.fuel_left)
+		summary = laps.add(f)
+		if(summary):
+			summary['file'] = basename(fn)
+			summary['sectors'] = splits
+			summary['fuel_avg'] = round(fuel.avg, 3) if fuel.avg else None
+			summary['tire_baseline'] = [round(b, 1) for b in tires.baseline] if tires.baseline else None
+			results.append(summary)
+			splits = [None]*3
+	rec.close()
+	return {'file':basename(fn), 'struct':rec.header['struct'], 'frames':frames, 'laps':results}
+
+def fmt(v, spec='{0:.3f}'):
+	return '-' if v is None else spec.format(v)
+
+def table(laps):
+	rows = ['{0:<40} {1:>4} {2:>9} {3:>8} {4:>8} {5:>8} {6:>6} {7:>6} {8:>6} {9:>6}'.format(
+		'file', 'lap', 'time', 's1', 's2', 's3', 'fuel', 'avg', 'v max', 'tires')]
+	for l in laps:
+		rows.append('{0:<40} {1:>4}{2} {3:>9} {4:>8} {5:>8} {6:>8} {7:>6} {8:>6} {9:>6} {10:>6}'.format(
+			l['file'][-40:], l['lap'], '*' if l['partial'] else ' ', fmt(l['time']),
+			fmt(l['sectors'][0]), fmt(l['sectors'][1]), fmt(l['sectors'][2]),
+			fmt(l['fuel_used'], '{0:.2f}'), fmt(l['fuel_avg'], '{0:.2f}'),
+			fmt(l['speed']['max'] if l['speed'] else None, '{0:.1f}'), fmt(l['tire_temp']['mean'] if l['tire_temp'] else None, '{0:.1f}')))
+	return '\n'.join(rows)
+
+if __name__ == '__main__':
+	freeze_support()
+	from sys import argv, exit
+	if(len(argv) < 2):
+		print "Usage: {0} <directory> [processes]".format(basename(argv[0]))
+		exit(1)
+	path = argv[1]
+	processes = int(argv[2]) if len(argv) > 2 else cpu_count()
+	settings, cache = load_settings(path)
+	files = sorted([join(path, n) for n in listdir(path) if n.endswith('.rec')])
+	if(not files):
+		print "No recordings found in {0}".format(path)
+		exit(1)
+	print "Analysing {0} recordings with {1} processes".format(len(files), processes)
+	pool = Pool(processes)
+	laps = []
+	try:
+		# one file per task, results arrive as files finish
+		for r in pool.imap_unordered(analyse, [(fn, settings, cache) for fn in files]):
+			if(r.get('error')):
+				print "Unable to analyse {0}:\n{1}".format(r['file'], r['error'])
+				continue
+			print "{0}: {1} frames, {2} laps".format(r['file'], r['frames'], len(r['laps']))
+			laps += r['laps']
+	finally:
+		pool.close()
+		pool.join()
+	laps.sort(key=lambda l:(l['file'], l['lap']))
+	print table(laps)
+	out = join(path, 'pyDash.batch.json')
+	with open(out, 'w') as f:
+		for l in laps:
+			f.write(json.dumps(l, sort_keys=True) + '\n')
+	print "{0} laps written to {1}".format(len(laps), out)
@@ -0,0 +1,97 @@
+"""
+pyDashBlackBox.py - Keeps the last minute of telemetry in memory, written to disk on trigger
+by Dan Allongo (daniel.s.allongo@gmail.com)
+
+Normalized frames (pyDashBus.dashFrame) are copied into a fixed-size ring
+('seconds' x 'rate' records in one pre-allocated buffer) at a reduced rate.
+Nothing touches the disk until a trigger fires (critical fuel, overheating,
+critical tire temperature, an unhandled exception in the game loop), then
+the ring is written out as a pyDash recording (see pyDashRec) on a
+background thread:
+	pyDash.blackbox.<date>-<time>.<reason>.rec
+
+The same reason does not trigger again until the ring has been refilled.
+
+Release History:
+2026-10-19: Initial release
+"""
+
+from threading import Thread
+from time import time, strftime, localtime
+from ctypes import sizeof
+from pyDashMetrics import timer
+from pyDashBus import dashFrame
+from pyDashRec import recordingWriter, stamp
+
+class blackBox:
+	def __init__(self, prefix, settings, log_print=None, metrics=None):
+		self.prefix = prefix
+		self.log_print = log_print
+		self.metrics = metrics
+		self.record_size = stamp.size + sizeof(dashFrame)
+		self.configure(settings)
+
+	def configure(self, settings):
+		s = settings['blackbox']
+		self.enabled = s['enabled']
+		self.period = 1.0/s['rate']
+		self.window = s['seconds']
+		size = int(s['seconds']*s['rate'])
+		# buffer is only re-allocated when the size changes
+		if(getattr(self, 'size', None) != size):
+			self.size = size
+			self.buf = bytearray(size*self.record_size)
+			self.reset()
+		return
+
+	def reset(self):
+		self.count = 0
+		self.next_sample = 0
+		self.last_trigger = {}
+		return
+
+	def due(self, now):
+		return self.enabled and now >= self.next_sample
+
+	def add(self, now, frame):
+		if(not self.due(now)):
+			return
+		self.next_sample = now + self.period
+		o = (self.count % self.size)*self.record_size
+		self.buf[o:o + self.record_size] = stamp.pack(now) + buffer(frame)[:]
+		self.count += 1
+		return
+
+	def trigger(self, reason, now=None):
+		if(not self.enabled or not self.count):
+			return False
+		if(now is None):
+			now = timer()
+		if(now - self.last_trigger.get(reason, -self.window) < self.window):
+			return False
+		self.last_trigger[reason] = now
+		# oldest record first
+		n = min(self.count, self.size)
+		o = (self.count % self.size)*self.record_size if self.count > self.size else 0
+		data = str(self.buf[o:] + self.buf[:o]) if o else str(self.buf[:n*self.record_size])
+		first = stamp.unpack_from(data)[0]
+		started = time() - (now - first)
+		fn = '{0}.{1}.{2}.rec'.format(self.prefix, strftime('%Y%m%d-%H%M%S', localtime()), reason)
+		t = Thread(target=self.dump, args=(fn, data, n, started, reason), name='pyDashBlackBox')
+		t.daemon = True
+		t.start()
+		if(self.metrics):
+			self.metrics.count('blackbox_dumps')
+		return True
+
+	def dump(self, fn, data, n, started, reason):
+		try:
+			rec = recordingWriter(fn, dashFrame, started)
+			rec.write_records(data, n)
+			rec.close()
+			if(self.log_print):
+				self.log_print("Black box ({0}) written to {1}".format(reason, fn))
+		except:
+			if(self.log_print):
+				self.log_print("Unable to write black box to {0}".format(fn))
+		return
@@ -0,0 +1,276 @@
+"""
+pyDashBus.py - Local telemetry bus, republishes the pyDash snapshot to other tools
+by Dan Allongo (daniel.s.allongo@gmail.com)
+
+When enabled in settings['bus'], the game loops fill one normalized
+dashFrame per sample (same units for every sim) and publish it into a ring
+of slots in a named shared memory block. Overlays, loggers, etc. attach to
+that block read-only instead of opening the sim's own mapping, so the sim
+is read once no matter how many tools are running.
+
+Shared memory layout (little endian):
+header: 24 bytes, magic 'PDB1', frame size (uint32), number of slots (uint32),
+	reserved (uint32), sequence number of the newest frame (uint64, 0 = none yet)
+slots: begin sequence (uint64), frame (frame size bytes), end sequence (uint64)
+
+A frame is complete when its slot's begin and end sequence numbers match,
+readers check both around their copy and retry when the writer got there
+first. The same ring carries the raw game structures from the reader
+process to the game loop when sampling is split off (see pyDashSplit).
+
+Run by itself, pyDashBus.py attaches to the bus and prints the newest frame.
+
+Release History:
+2026-10-19: Initial release
+	Ring shared with the pyDashSplit reader process
+	Frames can also be filled from generated decoders (see pyDashCodec)
+"""
+
+from ctypes import Structure, c_double, c_float, c_int, memmove, addressof, sizeof
+from mmap import mmap
+from struct import pack, unpack
+from math import pi
+
+# dashFrame.game
+games = {'r3e':1, 'rf1':2}
+
+class dashFrame(Structure):
+	_pack_ = 1
+	_fields_ = [('time', c_double),				# frame timestamp (s)
+				('game', c_int),				# games
+				('session', c_int),				# session type as reported by the sim
+				('engine_rpm', c_float),
+				('max_engine_rpm', c_float),
+				('speed', c_float),				# m/s
+				('gear', c_int),				# -1=reverse, 0=neutral, 1+=forward gears
+				('throttle', c_float),			# 0.0-1.0
+				('brake', c_float),				# 0.0-1.0
+				('fuel_left', c_float),			# L
+				('fuel_capacity', c_float),		# L, 0 if unknown
+				('water_temp', c_float),		# C
+				('oil_temp', c_float),			# C
+				('tire_temps', c_float*12),		# C, [FL left, FL center, FL right, FR left, ...]
+				('tire_pressure', c_float*4),	# kPa, [FL, FR, RL, RR]
+				('position', c_int),
+				('num_cars', c_int),
+				('completed_laps', c_int),
+				('number_of_laps', c_int),		# 0 for timed sessions
+				('sector', c_int),				# 1-3
+				('lap_time_current', c_float),	# s, 0 if invalid
+				('lap_time_previous', c_float),	# s
+				('lap_time_best', c_float),		# s
+				('in_pits', c_int)]
+
+def r3e_frame(smm, dd, f):
+	f.game = games['r3e']
+	f.session = smm.session_type
+	f.engine_rpm = smm.engine_rps*(60/(2*pi))
+	f.max_engine_rpm = smm.max_engine_rps*(60/(2*pi))
+	f.speed = smm.car_speed
+	f.gear = smm.gear
+	f.throttle = smm.throttle_pedal
+	f.brake = smm.brake_pedal
+	f.fuel_left = smm.fuel_left
+	f.fuel_capacity = smm.fuel_capacity
+	f.water_temp = smm.engine_water_temp
+	f.oil_temp = smm.engine_oil_temp
+	memmove(addressof(f.tire_temps), addressof(smm.tire_temps), sizeof(f.tire_temps))
+	memmove(addressof(f.tire_pressure), addressof(smm.tire_pressure), sizeof(f.tire_pressure))
+	f.position = dd.place
+	f.num_cars = smm.num_cars
+	f.completed_laps = smm.completed_laps
+	f.number_of_laps = max(smm.number_of_laps, 0)
+	f.sector = dd.track_sector
+	f.lap_time_current = max(smm.lap_time_current_self, 0)
+	f.lap_time_previous = max(smm.lap_time_previous_self, 0)
+	f.lap_time_best = max(smm.lap_time_best_self, 0)
+	f.in_pits = dd.in_pitlane
+	return f
+
+def rf1_frame(smm, dd, f):
+	f.game = games['rf1']
+	f.session = smm.session
+	f.engine_rpm = smm.engineRPM
+	f.max_engine_rpm = smm.engineMaxRPM
+	f.speed = smm.speed
+	f.gear = smm.gear
+	f.throttle = smm.unfilteredThrottle
+	f.brake = smm.unfilteredBrake
+	f.fuel_left = smm.fuel
+	f.fuel_capacity = 0
+	f.water_temp = smm.engineWaterTemp
+	f.oil_temp = smm.engineOilTemp
+	for i in xrange(4):
+		w = smm.wheel[i]
+		f.tire_temps[i*3:i*3 + 3] = list(w.temperature)
+		f.tire_pressure[i] = w.pressure
+	f.position = dd.place
+	f.num_cars = smm.numVehicles
+	f.completed_laps = dd.totalLaps
+	# timed sessions report a huge number of laps
+	f.number_of_laps = max(smm.maxLaps, 0) if smm.maxLaps < 2000 else 0
+	# rfSector is 0 for the last sector
+	f.sector = dd.sector or 3
+	f.lap_time_current = max(smm.currentET - smm.lapStartET, 0) if smm.lapStartET > 0 else 0
+	f.lap_time_previous = max(dd.lastLapTime, 0)
+	f.lap_time_best = max(dd.bestLapTime, 0)
+	f.in_pits = int(dd.inPits)
+	return f
+
+# same as r3e_frame/rf1_frame from generated decoders (see pyDashCodec): 'd' has the channels of the
+# structure, 'dd' the player channels of one of the first cars(d) entries of 'array', player(d, dd) if it is the player's
+r3e_channels = ['session_type', 'engine_rps', 'max_engine_rps', 'car_speed', 'gear', 'throttle_pedal', 'brake_pedal',
+	'fuel_left', 'fuel_capacity', 'engine_water_temp', 'engine_oil_temp', 'tire_temps', 'tire_pressure', 'num_cars',
+	'completed_laps', 'number_of_laps', 'lap_time_current_self', 'lap_time_previous_self', 'lap_time_best_self', 'slot_id']
+r3e_array = 'all_drivers_data_1'
+r3e_player_channels = ['driver_info.slot_id', 'place', 'track_sector', 'in_pitlane']
+
+def r3e_cars(d):
+	return d['num_cars']
+
+def r3e_player(d, dd):
+	return dd['driver_info.slot_id'] == d['slot_id']
+
+def r3e_values(d, dd, f):
+	f.game = games['r3e']
+	f.session = d['session_type']
+	f.engine_rpm = d['engine_rps']*(60/(2*pi))
+	f.max_engine_rpm = d['max_engine_rps']*(60/(2*pi))
+	f.speed = d['car_speed']
+	f.gear = d['gear']
+	f.throttle = d['throttle_pedal']
+	f.brake = d['brake_pedal']
+	f.fuel_left = d['fuel_left']
+	f.fuel_capacity = d['fuel_capacity']
+	f.water_temp = d['engine_water_temp']
+	f.oil_temp = d['engine_oil_temp']
+	f.tire_temps[:] = d['tire_temps']
+	f.tire_pressure[:] = d['tire_pressure']
+	f.position = dd['place']
+	f.num_cars = d['num_cars']
+	f.completed_laps = d['completed_laps']
+	f.number_of_laps = max(d['number_of_laps'], 0)
+	f.sector = dd['track_sector']
+	f.lap_time_current = max(d['lap_time_current_self'], 0)
+	f.lap_time_previous = max(d['lap_time_previous_self'], 0)
+	f.lap_time_best = max(d['lap_time_best_self'], 0)
+	f.in_pits = dd['in_pitlane']
+	return f
+
+rf1_channels = ['session', 'engineRPM', 'engineMaxRPM', 'speed', 'gear', 'unfilteredThrottle', 'unfilteredBrake', 'fuel',
+	'engineWaterTemp', 'engineOilTemp', 'wheel.temperature', 'wheel.pressure', 'numVehicles', 'maxLaps', 'currentET', 'lapStartET']
+rf1_array = 'vehicle'
+rf1_player_channels = ['isPlayer', 'place', 'totalLaps', 'sector', 'lastLapTime', 'bestLapTime', 'inPits']
+
+def rf1_cars(d):
+	return d['numVehicles']
+
+def rf1_player(d, dd):
+	return dd['isPlayer']
+
+def rf1_values(d, dd, f):
+	f.game = games['rf1']
+	f.session = d['session']
+	f.engine_rpm = d['engineRPM']
+	f.max_engine_rpm = d['engineMaxRPM']
+	f.speed = d['speed']
+	f.gear = d['gear']
+	f.throttle = d['unfilteredThrottle']
+	f.brake = d['unfilteredBrake']
+	f.fuel_left = d['fuel']
+	f.fuel_capacity = 0
+	f.water_temp = d['engineWaterTemp']
+	f.oil_temp = d['engineOilTemp']
+	f.tire_temps[:] = d['wheel.temperature']
+	f.tire_pressure[:] = d['wheel.pressure']
+	f.position = dd['place']
+	f.num_cars = d['numVehicles']
+	f.completed_laps = dd['totalLaps']
+	f.number_of_laps = max(d['maxLaps'], 0) if d['maxLaps'] < 2000 else 0
+	f.sector = dd['sector'] or 3
+	f.lap_time_current = max(d['currentET'] - d['lapStartET'], 0) if d['lapStartET'] > 0 else 0
+	f.lap_time_previous = max(dd['lastLapTime'], 0)
+	f.lap_time_best = max(dd['bestLapTime'], 0)
+	f.in_pits = int(dd['inPits'])
+	return f
+
+class telemetryRing:
+	magic = 'PDB1'
+	header = 24
+
+	# the writer creates the block, readers attach to an existing one ('slots' is read from its header)
+	def __init__(self, name, frame_type, slots=64, writer=False):
+		self.name = name
+		self.frame_size = sizeof(frame_type)
+		self.writer = writer
+		if(writer):
+			self.slots = int(slots)
+			self.handle = mmap(fileno=0, length=self.header + self.slots*self.slot_size(), tagname=name)
+			self.handle[0:self.header] = pack('<4sIIIQ', self.magic, self.frame_size, self.slots, 0, 0)
+		else:
+			h = mmap(fileno=0, length=self.header, tagname=name)
+			magic, frame_size, self.slots, r, seq = unpack('<4sIIIQ', h[0:self.header])
+			h.close()
+			if(magic != self.magic or frame_size != self.frame_size):
+				raise ValueError("{0} is not a bus of {1}".format(name, frame_type.__name__))
+			self.handle = mmap(fileno=0, length=self.header + self.slots*self.slot_size(), tagname=name)
+		self.sequence = 0
+
+	def slot_size(self):
+		return self.frame_size + 16
+
+	def close(self):
+		self.handle.close()
+		return
+
+	def publish(self, frame):
+		self.sequence += 1
+		s = pack('<Q', self.sequence)
+		o = self.header + (self.sequence % self.slots)*self.slot_size()
+		h = self.handle
+		h[o:o + 8] = s
+		h[o + 8:o + 8 + self.frame_size] = buffer(frame)[:]
+		h[o + 8 + self.frame_size:o + 16 + self.frame_size] = s
+		h[16:24] = s
+		return self.sequence
+
+	def newest(self):
+		return unpack('<Q', self.handle[16:24])[0]
+
+	# copy frame 'seq' into 'frame', False if it has been overwritten (or is being written)
+	def read(self, seq, frame):
+		o = self.header + (seq % self.slots)*self.slot_size()
+		h = self.handle
+		end = h[o + 8 + self.frame_size:o + 16 + self.frame_size]
+		data = h[o + 8:o + 8 + self.frame_size]
+		if(h[o:o + 8] != end or unpack('<Q', end)[0] != seq):
+			return False
+		memmove(addressof(frame), data, self.frame_size)
+		return True
+
+	# copy the newest complete frame into 'frame', returns its sequence number (0 if none)
+	def latest(self, frame, retries=3):
+		for i in xrange(retries + 1):
+			seq = self.newest()
+			if(not seq):
+				return 0
+			if(self.read(seq, frame)):
+				return seq
+		return 0
+
+
+if __name__ == '__main__':
+	from time import sleep
+	from sys import argv
+	name = argv[1] if len(argv) > 1 else 'pyDashBus'
+	print "Attaching to {0}...".format(name)
+	bus = telemetryRing(name, dashFrame)
+	f = dashFrame()
+	last = 0
+	while(True):
+		seq = bus.latest(f)
+		if(seq and seq != last):
+			print "#{0} {1:.2f}s gear {2} {3:5.0f} rpm {4:5.1f} m/s P{5}/{6} lap {7} fuel {8:.1f} L".format(seq,
+				f.time, f.gear, f.engine_rpm, f.speed, f.position, f.num_cars, f.completed_laps, f.fuel_left)
+			last = seq
+		sleep(0.1)
@@ -0,0 +1,254 @@
+"""
+pyDashCodec.py - Generated struct decoders for selected channels of the sim shared memory structures
+by Dan Allongo (daniel.s.allongo@gmail.com)
+
+Usage: pyDashCodec.py [cache directory]
+
+Reading a ctypes structure goes through a Python-level descriptor for every
+field, and from_buffer_copy() copies the whole structure (28 KB for R3E,
+40 KB for rFactor) just to read a handful of values. load() instead walks
+the _fields_ of the structure once (the same walk as the columnar export,
+see pyDashExport) and generates a module with one struct.Struct covering
+only the requested channels, the bytes in between are skipped as padding:
+	decode(buf, offset=0): dict of requested channel -> value, unpacked
+		straight from the buffer (ie, a recording's memory map)
+	encode(values): bytes of the whole structure with the requested channels
+		set and everything else zero (test data)
+	size, fmt, names
+
+A channel is a column name from pyDashExport (ie, 'car_speed',
+'all_drivers_data_1.driver_info.slot_id') or the name of a structure or
+array, which decodes to a flat tuple of everything under it (ie, 'tire_temps'
+gives the 12 tread temperatures). Arrays of structures (drivers, wheels)
+decode to a tuple with one value per element. When only one element is
+needed (ie, the player's entry in the driver array), load() with 'array'
+gives a decoder for channels of a single element instead:
+	decode(buf, offset=0, i=0): the channels of element i
+
+Generated modules are cached in pyDash.codec/ next to the settings file,
+named after the structure and a hash of its schema (every channel's offset,
+type and shape) and the requested channels. A cached file is only loaded
+if its first line carries the same hash, so a changed game API (new fields)
+gets a new decoder instead of one with a stale layout.
+
+The decoders are only used for offline batch analysis (pyDashBatch). The
+live game loops (pyDashR3E, pyDashRF1) still read the snapshot copied into
+the ctypes structure (see pyDashRead), so their per-tick decoding and their
+start-up time are unchanged.
+
+Run by itself, pyDashCodec.py times filling a dashFrame from a raw frame
+with the decoders used by pyDashBatch against doing it through ctypes.
+
+Release History:
+2026-10-19: Initial release
+	Decoders cover only the requested channels, cache lives next to the settings file
+	Only used by batch analysis, not by the live game loops
+"""
+
+from hashlib import sha1
+from os import makedirs, rename, remove, getpid
+from os.path import join, exists, isdir
+from ctypes import sizeof
+import imp
+from pyDashExport import columns
+
+# bump when the generated source changes so cached modules are regenerated
+generator = 2
+
+codes = {'<f4':'f', '<f8':'d', '|i1':'b', '<i2':'h', '<i4':'i', '<i8':'q',
+	'|u1':'B', '<u2':'H', '<u4':'I', '<u8':'Q', '|b1':'?'}
+
+# loaded decoders by (structure, channels)
+loaded = {}
+
+# element type, offset and size of a top-level array of structures
+def element(struct, array):
+	t = dict([f[:2] for f in struct._fields_])[array]
+	return t._type_, getattr(struct, array).offset, sizeof(t._type_)
+
+def schema(struct, channels, array=None):
+	cols = columns(element(struct, array)[0] if array else struct, drivers=True)
+	text = '\n'.join(['{0} {1} {2} {3} {4}'.format(struct.__name__, sizeof(struct), generator, array, ','.join(channels))] +
+		['{0} {1} {2} {3}'.format(c.name, c.descr, c.shape, c.segments) for c in cols])
+	return cols, sha1(text).hexdigest()
+
+def fmt_code(descr):
+	if(descr[1] == 'S'):
+		return descr[2:] + 's'
+	return codes[descr]
+
+# columns for each requested channel, exact name or everything under it
+def select(cols, channels):
+	groups = []
+	for ch in channels:
+		g = [c for c in cols if c.name == ch or c.name.startswith(ch + '.')]
+		if(not g):
+			raise KeyError(ch)
+		groups.append(g)
+	return groups
+
+def regular(idx):
+	return len(idx) > 1 and all([b - a == idx[1] - idx[0] for a, b in zip(idx, idx[1:])])
+
+def indices(idx):
+	if(regular(idx)):
+		return 'v[{0}:{1}:{2}]'.format(idx[0], idx[-1] + 1, idx[1] - idx[0])
+	return '({0},)'.format(', '.join(['v[{0}]'.format(i) for i in idx]))
+
+# value of a channel from the unpacked tuple 'v', strings end at the first NUL like ctypes
+def value(g, idx):
+	if(len(g) == 1 and not g[0].shape):
+		if(g[0].descr[1] == 'S'):
+			return "v[{0}].split('\\0', 1)[0]".format(idx[0])
+		return 'v[{0}]'.format(idx[0])
+	if(len(g) == 1 and g[0].descr[1] == 'S'):
+		return "tuple([s.split('\\0', 1)[0] for s in {0}])".format(indices(idx))
+	return indices(idx)
+
+def assign(name, g, idx):
+	if(len(g) == 1 and not g[0].shape):
+		return '\tv[{0}] = get({1!r}, zero[{0}])'.format(idx[0], name)
+	if(regular(idx)):
+		return '\tv[{0}:{1}:{2}] = get({3!r}, zero[{0}:{1}:{2}])'.format(idx[0], idx[-1] + 1, idx[1] - idx[0], name)
+	return '\tfor i, x in zip({0!r}, get({1!r}, ())):\n\t\tv[i] = x'.format(tuple(idx), name)
+
+def generate(struct, channels, array=None):
+	cols, h = schema(struct, channels, array)
+	base, stride = 0, 0
+	if(array):
+		el, base, stride = element(struct, array)
+	groups = select(cols, channels)
+	# every item of every requested channel in frame order
+	items = []
+	for n, g in enumerate(groups):
+		for c in g:
+			k = int(c.descr[2:])
+			for o, s in c.segments:
+				for j in xrange(s/k):
+					items.append((o + j*k, k, fmt_code(c.descr), n))
+	items.sort()
+	start = items[0][0]
+	index = [[] for g in groups]
+	parts = []
+	p = start
+	for i, (o, k, code, n) in enumerate(items):
+		if(o > p):
+			parts.append('{0}x'.format(o - p))
+		parts.append(code)
+		index[n].append(i)
+		p = o + k
+	# runs of the same numeric type, 'fffi' -> '3fi'
+	runs = []
+	for code in parts:
+		if(runs and len(code) == 1 and runs[-1][1] == code):
+			runs[-1][0] += 1
+		else:
+			runs.append([1, code])
+	fmt = '<' + ''.join([(str(n) if n > 1 else '') + code for n, code in runs])
+	src = ['# generated by pyDashCodec from {0}, schema {1}'.format(struct.__name__, h),
+		'from struct import Struct',
+		'',
+		'size = {0}'.format(sizeof(struct)),
+		'stride = {0}'.format(stride),
+		'start = {0}'.format(base + start),
+		'fmt = Struct({0!r})'.format(fmt),
+		'names = ({0})'.format(''.join(['{0!r}, '.format(ch) for ch in channels])),
+		"zero = fmt.unpack('\\0'*fmt.size)",
+		'',
+		'def decode(buf, offset=0, i=0):',
+		'\tv = fmt.unpack_from(buf, offset + start + i*stride)',
+		'\treturn {']
+	src += ['\t\t{0!r}:{1},'.format(ch, value(g, idx)) for ch, g, idx in zip(channels, groups, index)]
+	src += ['\t}',
+		'',
+		'def encode(values, i=0):',
+		'\tv = list(zero)',
+		'\tget = values.get']
+	src += [assign(ch, g, idx) for ch, g, idx in zip(channels, groups, index)]
+	src += ['\to = start + i*stride',
+		"\treturn '\\0'*o + fmt.pack(*v) + '\\0'*(size - o - fmt.size)"]
+	return h, '\n'.join(src) + '\n'
+
+# decoder module for some channels of a ctypes structure (or of one element of 'array'), generated on first use and cached in 'cache'
+def load(struct, channels, cache, array=None):
+	channels = tuple(channels)
+	if((struct, channels, array) in loaded):
+		return loaded[(struct, channels, array)]
+	cols, h = schema(struct, channels, array)
+	name = 'codec_{0}_{1}'.format('_'.join([struct.__name__] + ([array] if array else [])), h[:16])
+	fn = join(cache, name + '.py')
+	codec = None
+	try:
+		# only files this generator wrote for the same schema and channels are loaded
+		with open(fn, 'r') as f:
+			if(f.readline().split()[-1] == h):
+				codec = imp.load_source(name, fn)
+	except:
+		codec = None
+	if(codec is None):
+		h, src = generate(struct, channels, array)
+		try:
+			if(not isdir(cache)):
+				makedirs(cache)
+			# written under a temporary name so a crash (or another batch worker) cannot leave half a module behind
+			tmp = '{0}.{1}.tmp'.format(fn, getpid())
+			with open(tmp, 'w') as f:
+				f.write(src)
+			if(exists(fn)):
+				remove(fn)
+			rename(tmp, fn)
+			codec = imp.load_source(name, fn)
+		except (IOError, OSError):
+			# read-only install, keep the decoder in memory only
+			codec = imp.new_module(name)
+			exec compile(src, fn, 'exec') in codec.__dict__
+	loaded[(struct, channels, array)] = codec
+	return codec
+
+if __name__ == '__main__':
+	from sys import argv
+	from timeit import repeat
+	from pyR3E import r3e_shared
+	from pyRF1 import rfShared
+	from pyDashBus import dashFrame, r3e_frame, rf1_frame
+	from pyDashBus import r3e_channels, r3e_array, r3e_player_channels, r3e_player, r3e_values
+	from pyDashBus import rf1_channels, rf1_array, rf1_player_channels, rf1_player, rf1_values
+	cache = argv[1] if len(argv) > 1 else 'pyDash.codec'
+	# 20 cars with the player in the middle of the field
+	r3e = r3e_shared()
+	r3e.num_cars = 20
+	r3e.slot_id = 10
+	for i in xrange(20):
+		r3e.all_drivers_data_1[i].driver_info.slot_id = i
+	rf1 = rfShared()
+	rf1.numVehicles = 20
+	rf1.vehicle[10].isPlayer = True
+	# how pyDashBatch filled a dashFrame from a recorded frame before
+	def r3e_ctypes(buf, f):
+		smm = r3e_shared.from_buffer_copy(buf)
+		for d in smm.all_drivers_data_1[:smm.num_cars]:
+			if(d.driver_info.slot_id == smm.slot_id):
+				return r3e_frame(smm, d, f)
+	def rf1_ctypes(buf, f):
+		smm = rfShared.from_buffer_copy(buf)
+		for d in smm.vehicle[:smm.numVehicles]:
+			if(d.isPlayer):
+				return rf1_frame(smm, d, f)
+	# and how it does now, with the player's entry found on an earlier frame (see pyDashBatch.decoded)
+	def decoders(buf, f, codec, player_codec, player, values):
+		d = codec.decode(buf)
+		dd = player_codec.decode(buf, 0, 10)
+		if(player(d, dd)):
+			return values(d, dd, f)
+	for smm, channels, array, player_channels, player, values, ctypes_frame in [
+			(r3e, r3e_channels, r3e_array, r3e_player_channels, r3e_player, r3e_values, r3e_ctypes),
+			(rf1, rf1_channels, rf1_array, rf1_player_channels, rf1_player, rf1_values, rf1_ctypes)]:
+		codec = load(type(smm), channels, cache)
+		player_codec = load(type(smm), player_channels, cache, array)
+		buf = str(buffer(smm)[:])
+		f = dashFrame()
+		n = 2000
+		t_ctypes = min(repeat(lambda: ctypes_frame(buf, f), number=n, repeat=5))
+		t_codec = min(repeat(lambda: decoders(buf, f, codec, player_codec, player, values), number=n, repeat=5))
+		print "{0}: {1}+{2} channels, ctypes {3:.1f} us, decoders {4:.1f} us per frame ({5:.1f}x)".format(
+			type(smm).__name__, len(channels), len(player_channels), t_ctypes*1e6/n, t_codec*1e6/n, t_ctypes/t_codec)
@@ -0,0 +1,139 @@
+"""
+pyDashExport.py - Columnar export of pyDash recordings to NumPy .npy files
+by Dan Allongo (daniel.s.allongo@gmail.com)
+
+Usage: pyDashExport.py <recording> [--drivers] [channel ...]
+
+A recording (see pyDashRec) stores one ctypes structure per frame. The
+exporter turns it into one .npy file per channel in <recording>.npy/, so
+analysis tools can np.load(..., mmap_mode='r') only the channels they need.
+Channels and their types come from the _fields_ of the recorded structure:
+numeric fields become columns named by their path (ie, 'tire_temps.frontleft_left'),
+numeric arrays add a dimension, byte strings become fixed width 'S' columns
+and arrays of structures are expanded into one column per field with a
+dimension per element. The driver arrays (128 entries) are only exported
+with --drivers. Frame timestamps are written to t.npy.
+
+Frames are little endian structures, so every column is copied straight out
+of the memory-mapped recording without decoding a single value. numpy is
+not needed to write the files.
+
+Release History:
+2026-10-19: Initial release
+"""
+
+from ctypes import Structure, Array, c_char, sizeof
+from struct import pack
+from os import mkdir
+from os.path import join, isdir
+from pyDashRec import recordingReader, stamp
+
+# ctypes type codes -> NumPy kind, the size is taken from the type (c_long is 4 bytes on Windows)
+kinds = {'f':'f', 'd':'f', 'b':'i', 'h':'i', 'i':'i', 'l':'i', 'q':'i',
+	'B':'u', 'H':'u', 'I':'u', 'L':'u', 'Q':'u', '?':'b'}
+
+# arrays of drivers/vehicles, only expanded when asked for
+driver_arrays = ['all_drivers_data_1', 'vehicle']
+
+# frames per copy, bounds memory use for long recordings
+chunk = 4096
+
+class column:
+	def __init__(self, name, descr, shape, segments):
+		self.name = name
+		self.descr = descr
+		# per frame, the row count is added on export
+		self.shape = shape
+		# (offset, size) within the frame, in C order
+		self.segments = merge(segments)
+
+def merge(segments):
+	merged = []
+	for o, s in segments:
+		if(merged and merged[-1][0] + merged[-1][1] == o):
+			merged[-1] = (merged[-1][0], merged[-1][1] + s)
+		else:
+			merged.append((o, s))
+	return merged
+
+def descr(t):
+	code = getattr(t, '_type_', None)
+	if(not isinstance(code, str) or code not in kinds):
+		return None
+	size = sizeof(t)
+	return '{0}{1}{2}'.format('|' if size == 1 else '<', kinds[code], size)
+
+# columns of a ctypes structure, 'offsets' are the positions of every instance of it within the frame
+def columns(struct, drivers=False, prefix='', offsets=(0,), shape=()):
+	cols = []
+	for f in struct._fields_:
+		name, t = f[:2]
+		# padding and bit fields
+		if(name.startswith('_') or len(f) > 2):
+			continue
+		o = [b + getattr(struct, name).offset for b in offsets]
+		cols += field(prefix + name, t, drivers, o, shape)
+	return cols
+
+def field(name, t, drivers, offsets, shape):
+	if(issubclass(t, Structure)):
+		return columns(t, drivers, name + '.', offsets, shape)
+	if(issubclass(t, Array)):
+		el = t._type_
+		n = t._length_
+		if(el is c_char):
+			return [column(name, '|S{0}'.format(n), shape, [(o, n) for o in offsets])]
+		if(descr(el)):
+			return [column(name, descr(el), shape + (n,), [(o, sizeof(t)) for o in offsets])]
+		if(issubclass(el, (Structure, Array))):
+			if(name.split('.')[-1] in driver_arrays and not drivers):
+				return []
+			return field(name, el, drivers, [o + i*sizeof(el) for o in offsets for i in xrange(n)], shape + (n,))
+		# wide strings have no fixed width NumPy equivalent
+		return []
+	if(descr(t)):
+		return [column(name, descr(t), shape, [(o, sizeof(t)) for o in offsets])]
+	return []
+
+# version 1.0 header, padded so the data starts on a 16 byte boundary
+def npy_header(descr, shape):
+	h = "{{'descr': '{0}', 'fortran_order': False, 'shape': {1}, }}".format(descr, repr(tuple(shape)))
+	h += ' '*(15 - (len(h) + 10) % 16) + '\n'
+	return '\x93NUMPY\x01\x00' + pack('<H', len(h)) + h
+
+def write_column(rec, col, fn):
+	m = rec.map
+	base = rec.header['header_size'] + stamp.size
+	size = rec.record_size
+	with open(fn, 'wb') as f:
+		f.write(npy_header(col.descr, (rec.count,) + col.shape))
+		for start in xrange(0, rec.count, chunk):
+			frames = xrange(base + start*size, base + min(start + chunk, rec.count)*size, size)
+			f.write(''.join([m[b + o:b + o + s] for b in frames for o, s in col.segments]))
+	return
+
+# returns the names of the exported channels, 'select' limits the export to channels starting with any of its names
+def export(fn, out=None, drivers=False, select=None):
+	rec = recordingReader(fn)
+	try:
+		out = out or fn[:-4] + '.npy'
+		if(not isdir(out)):
+			mkdir(out)
+		# the timestamp sits just before each frame
+		cols = [column('t', '<f8', (), [(-stamp.size, stamp.size)])] + columns(rec.frame_type, drivers)
+		if(select):
+			cols = [c for c in cols if c.name == 't' or any(c.name == s or c.name.startswith(s + '.') for s in select)]
+		for c in cols:
+			write_column(rec, c, join(out, c.name + '.npy'))
+	finally:
+		rec.close()
+	return [c.name for c in cols]
+
+if __name__ == '__main__':
+	from sys import argv, exit
+	args = [a for a in argv[1:] if not a.startswith('--')]
+	if(not args):
+		print "Usage: pyDashExport.py <recording> [--drivers] [channel ...]"
+		exit(1)
+	names = export(args[0], drivers='--drivers' in argv, select=args[1:])
+	print "{0} channels written to {1}".format(len(names), args[0][:-4] + '.npy')
@@ -0,0 +1,95 @@
+"""
+pyDashFuel.py - Fuel use averaging and race fuel strategy for pyDash
+by Dan Allongo (daniel.s.allongo@gmail.com)
+
+Fuel used in each sector feeds a weighted moving average (newest sectors
+count the most). Once per sector the strategy combines that average with
+the fuel on board and the laps (or time) left in the session to work out
+the fuel needed to finish and how much to add at the next stop (no more
+than the tank has room for right now). The results are cached until the
+next sector so the game loops only read them.
+
+Release History:
+2026-10-19: Initial release, fuel averaging moved here from pyDashR3E/pyDashRF1
+	Fuel to add and stops account for the fuel already in the tank
+"""
+
+from math import ceil
+
+# laps left including the one in progress, timed sessions finish the lap running when time expires
+def laps_remaining(laps_total, laps_done, time_left, lap_time, lap_fraction=0):
+	if(laps_total > 0):
+		return max(laps_total - laps_done - lap_fraction, 0)
+	if(time_left > 0 and lap_time > 0):
+		return ceil(time_left/lap_time + lap_fraction) - lap_fraction
+	return None
+
+class fuelStrategy:
+	def __init__(self, settings):
+		self.configure(settings)
+		self.reset()
+
+	def configure(self, settings):
+		self.settings = settings['fuel']
+		return
+
+	def reset(self):
+		self.samples = []
+		self.compare = 0
+		self.avg = None
+		self.laps_of_fuel = None
+		self.needed = None
+		self.to_add = None
+		self.stops = None
+		return
+
+	# fuel left when crossing into a new sector, ignores the first sector after refuelling
+	# returns True when the average has been updated
+	def sector(self, fuel_left):
+		updated = False
+		if(self.compare > 0 and self.compare > fuel_left):
+			self.samples.append(self.compare - fuel_left)
+			n = int(3*self.settings['samples'])
+			if(len(self.samples) > n):
+				self.samples = self.samples[-n:]
+				wn = 0
+				wd = 0
+				for i in xrange(0, len(self.samples)):
+					wn += self.samples[i]*(i+1)
+					wd += (i+1)
+				self.avg = wn*3/wd
+				updated = True
+		self.compare = fuel_left
+		return updated
+
+	# capacity of 0 means unknown (no stop count)
+	def plan(self, fuel_left, laps_left, capacity=0):
+		if(not self.avg):
+			return
+		self.laps_of_fuel = fuel_left/self.avg
+		if(laps_left is None):
+			self.needed = None
+			self.to_add = None
+			self.stops = None
+			return
+		self.needed = (laps_left + self.settings['margin'])*self.avg
+		extra = max(self.needed - fuel_left, 0)
+		self.to_add = extra
+		self.stops = None
+		if(capacity > 0):
+			# the next stop tops up the tank, any further stops start from an empty one
+			self.to_add = min(extra, max(capacity - fuel_left, 0))
+			self.stops = 0 if extra <= 0 else 1 + int(ceil((extra - self.to_add)/capacity))
+		return
+
+	# info page: fuel to add on the left, laps of fuel on board on the right ('+' is not on the 7-segment display)
+	def show(self, dash):
+		if(self.to_add is None):
+			dash.left = '--.-'
+		else:
+			dash.left = dash.cache.format(round(self.to_add, 1), '{0:.1f}')
+		if(self.laps_of_fuel is None):
+			dash.right = '--.-'
+		else:
+			dash.right = dash.cache.format(round(self.laps_of_fuel, 1), '{0:.1f}')
+		return
@@ -0,0 +1,76 @@
+"""
+pyDashInfo.py - Compiles the info text pages shown at the start of each lap
+by Dan Allongo (daniel.s.allongo@gmail.com)
+
+The enabled pages from settings['info_text'] are laid out once per settings
+load into a table of fixed time slots, so finding the page to show for the
+time elapsed since crossing the line is a single index operation.
+
+Pages can also be called up on demand with a button on the SRD-9c, each
+press shows the next page from settings['buttons']['pages'] for one info
+text duration.
+
+Release History:
+2026-10-19: Initial release
+	Added on-demand pages for the SRD-9c buttons
+	Comparison lap is only updated after the lap split page, wherever it is in the order
+"""
+
+# pages that can be listed in settings['info_text']['pages']
+info_pages = ['lap_split', 'position', 'remaining', 'tires', 'fuel']
+# lap_split is tied to crossing the line so it cannot be called up on demand
+demand_pages = ['position', 'remaining', 'tires', 'fuel']
+
+class infoPhases:
+	# time slot size in seconds
+	resolution = 0.05
+
+	def __init__(self, settings):
+		self.demand_index = 0
+		self.demand_until = 0
+		self.compile(settings)
+
+	def compile(self, settings):
+		it = settings['info_text']
+		# pages without their own info_text entry follow the feature setting (ie, settings['tires'])
+		self.pages = [p for p in it['pages'] if p in info_pages and it.get(p, settings.get(p, {})).get('enabled', True)]
+		slots = int(round(it['duration']/self.resolution))
+		self.table = []
+		for p in self.pages:
+			self.table += [p]*slots
+		self.duration = len(self.table)*self.resolution
+		# the comparison lap can only move on once the lap split has been shown
+		if('lap_split' in self.pages):
+			self.split_end = (self.pages.index('lap_split') + 1)*slots*self.resolution
+		else:
+			self.split_end = 0
+		self.demand_pages = [p for p in settings['buttons']['pages'] if p in demand_pages]
+		self.demand_duration = it['duration']
+		return
+
+	# button pressed, show the next on-demand page (the first one if none is showing)
+	def next_demand(self, now):
+		if(not self.demand_pages):
+			return
+		if(now < self.demand_until):
+			self.demand_index += 1
+		else:
+			self.demand_index = 0
+		self.demand_until = now + self.demand_duration
+		return
+
+	def demand(self, now):
+		if(now >= self.demand_until or not self.demand_pages):
+			return None
+		return self.demand_pages[self.demand_index % len(self.demand_pages)]
+
+	# true once the lap split is over (or not shown at all) 'et' seconds after the lap started
+	def split_done(self, et):
+		return et >= self.split_end
+
+	# page to show at 'et' seconds after the lap started, None once the sequence is over
+	def page(self, et):
+		i = int(et/self.resolution)
+		if(i < 0 or i >= len(self.table)):
+			return None
+		return self.table[i]
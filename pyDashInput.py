@@ -0,0 +1,59 @@
+"""
+pyDashInput.py - Turns SRD-9c button presses into dash actions
+by Dan Allongo (daniel.s.allongo@gmail.com)
+
+The srd9c class queues presses from the input report on the pywinusb
+reader thread, the game loop drains that queue once per sample (a deque
+check when nothing was pressed, the device itself is never polled).
+
+Actions are configured in settings['buttons']:
+'page' cycles through the on-demand info pages
+'ack' acknowledges warnings, silencing the warning text for 'ack_time' seconds
+
+Queue latency and press-to-display latency are reported to pyDash metrics.
+With HID writes on a sender thread the press-to-display time is recorded by
+srd9c after the write, not when the report is queued.
+
+Release History:
+2026-10-19: Initial release
+	Press to display time measured after threaded writes
+"""
+
+class dashInput:
+	def __init__(self, settings, dash, metrics):
+		self.dash = dash
+		self.metrics = metrics
+		# timestamps of handled presses waiting for the next HID write
+		self.pending = []
+		self.configure(settings)
+
+	def configure(self, settings):
+		self.settings = settings['buttons']
+		return
+
+	def poll(self, now, info, anim):
+		events = self.dash.events
+		while(events):
+			b, t = events.popleft()
+			self.metrics.stage('input_queue', now - t)
+			if(b == self.settings['page']):
+				info.next_demand(now)
+			elif(b == self.settings['ack']):
+				anim.mute(now + self.settings['ack_time'])
+			else:
+				continue
+			self.metrics.count('button_presses')
+			if(self.dash.sender):
+				self.dash.pressed(t)
+			else:
+				self.pending.append(t)
+		return
+
+	# call after each render, presses that did not change the display are not measured
+	def displayed(self, now, sent):
+		if(self.pending):
+			if(sent):
+				for t in self.pending:
+					self.metrics.stage('press_to_display', now - t)
+			self.pending = []
+		return
@@ -0,0 +1,128 @@
+"""
+pyDashLaps.py - Per-lap channel statistics accumulated while driving
+by Dan Allongo (daniel.s.allongo@gmail.com)
+
+Every sample of the normalized frame (pyDashBus.dashFrame) is folded into
+fixed-size accumulators for the current lap: count, min, max, sum and a
+histogram over a fixed range for each channel. Nothing else is kept, so
+memory use is the same for a sprint race or a 24 hour race.
+
+When the lap count goes up the summary is printed to the log and, with
+settings['laps']['store'], appended as one JSON object per line to
+pyDash.laps.json.
+
+Release History:
+2026-10-19: Initial release
+"""
+
+import json
+
+# name, range and number of histogram bins, values come from channel_values()
+channels = [('speed', 0, 100, 20),		# m/s
+	('rpm', 0, 1, 20),					# fraction of max RPM
+	('throttle', 0, 1, 10),
+	('brake', 0, 1, 10),
+	('water_temp', 40, 140, 20),		# C
+	('oil_temp', 40, 160, 24),			# C
+	('tire_temp', 20, 140, 24)]		# C, average of all tread temperatures
+
+def channel_values(f):
+	return (f.speed, f.engine_rpm/f.max_engine_rpm if f.max_engine_rpm > 0 else 0, f.throttle, f.brake,
+		f.water_temp, f.oil_temp, sum(f.tire_temps)/12.0)
+
+class channelStats:
+	def __init__(self, name, lo, hi, bins):
+		self.name = name
+		self.lo = lo
+		self.bins = bins
+		self.scale = bins/float(hi - lo)
+		self.reset()
+
+	def reset(self):
+		self.n = 0
+		self.total = 0.0
+		self.min = None
+		self.max = None
+		self.hist = [0]*self.bins
+		return
+
+	def add(self, v):
+		self.n += 1
+		self.total += v
+		if(self.min is None or v < self.min):
+			self.min = v
+		if(self.max is None or v > self.max):
+			self.max = v
+		self.hist[min(max(int((v - self.lo)*self.scale), 0), self.bins - 1)] += 1
+		return
+
+	def summary(self):
+		if(not self.n):
+			return None
+		return {'min':round(self.min, 3), 'max':round(self.max, 3), 'mean':round(self.total/self.n, 3), 'hist':list(self.hist)}
+
+class lapStats:
+	def __init__(self, sfn, settings, log_print=None):
+		self.sfn = sfn
+		self.log_print = log_print
+		self.stats = [channelStats(*c) for c in channels]
+		self.configure(settings)
+		self.reset()
+
+	def configure(self, settings):
+		self.settings = settings['laps']
+		self.enabled = self.settings['enabled']
+		return
+
+	def reset(self):
+		self.lap = None
+		self.fuel_start = None
+		self.fuel = None
+		# the first lap seen is only part of a lap
+		self.partial = True
+		for s in self.stats:
+			s.reset()
+		return
+
+	# returns the summary when the frame starts a new lap
+	def add(self, f):
+		if(not self.enabled):
+			return None
+		summary = None
+		if(self.lap is None):
+			self.lap = f.completed_laps
+			self.fuel_start = f.fuel_left
+		elif(f.completed_laps != self.lap):
+			if(f.completed_laps > self.lap):
+				summary = self.finish(f)
+			else:
+				self.partial = True
+			self.lap = f.completed_laps
+			self.fuel_start = f.fuel_left
+			for s in self.stats:
+				s.reset()
+		for s, v in zip(self.stats, channel_values(f)):
+			s.add(v)
+		self.fuel = f.fuel_left
+		return summary
+
+	def finish(self, f):
+		summary = {'lap':f.completed_laps, 'time':round(f.lap_time_previous, 3), 'partial':self.partial,
+			'samples':self.stats[0].n, 'position':f.position, 'game':f.game, 'session':f.session,
+			# refuelling during the lap makes this negative
+			'fuel_used':round(self.fuel_start - self.fuel, 3) if self.fuel is not None else None}
+		for s in self.stats:
+			summary[s.name] = s.summary()
+		self.partial = False
+		if(self.log_print and summary['speed']):
+			self.log_print("Lap {0} {1:.3f} {2}speed {3[mean]:.1f}/{3[max]:.1f} m/s, rpm {4[mean]:.0%}, throttle {5[mean]:.0%}, brake {6[mean]:.0%}, fuel {7} L".format(
+				summary['lap'], summary['time'], '(partial) ' if summary['partial'] else '', summary['speed'], summary['rpm'],
+				summary['throttle'], summary['brake'], summary['fuel_used']))
+		if(self.settings['store']):
+			try:
+				with open(self.sfn, 'a') as fh:
+					fh.write(json.dumps(summary, sort_keys=True) + '\n')
+			except IOError:
+				if(self.log_print):
+					self.log_print("Unable to write lap summary to {0}".format(self.sfn))
+		return summary
@@ -0,0 +1,138 @@
+"""
+pyDashLog.py - Buffered logging with a background writer thread for pyDash
+by Dan Allongo (daniel.s.allongo@gmail.com)
+
+log_print() only timestamps the message and appends it to an in-memory buffer,
+the console echo and file writes happen on the writer thread which flushes
+periodically (or as soon as the buffer fills up). The log file is rotated once
+it grows past the size limit. Bursts of an identical message (more than
+'repeat_burst' within 'repeat_window' seconds, ie, an exception loop) are
+counted instead of written, periodic status lines below that rate are all
+written. The writer thread reports the count once the window is over (or at
+close), with the times of the first and last suppressed repeat.
+
+Release History:
+2026-10-19: Initial release
+	Only bursts are suppressed, their counts are reported by the writer thread when the window ends
+"""
+
+from threading import Thread, Event, Lock
+from collections import deque
+from datetime import datetime
+from time import time
+from os import remove, rename
+from os.path import exists, getsize
+import atexit
+
+class dashLog:
+	def __init__(self, lfn, max_bytes=1024*1024, backups=3, flush_interval=1.0, repeat_window=10.0, repeat_burst=5, max_buffer=10000):
+		self.lfn = lfn
+		self.max_bytes = max_bytes
+		self.backups = backups
+		self.flush_interval = flush_interval
+		self.repeat_window = repeat_window
+		self.repeat_burst = repeat_burst
+		self.max_buffer = max_buffer
+		# deque.append/popleft are thread-safe, the lock keeps repeat counting consistent across callers
+		self.buffer = deque()
+		self.lock = Lock()
+		# message -> [window start, count in window, number suppressed, first suppressed, last suppressed]
+		self.recent = {}
+		self.wake = Event()
+		self.closed = False
+		self.thread = Thread(target=self.writer, name='pyDashLog')
+		self.thread.daemon = True
+		self.thread.start()
+		atexit.register(self.close)
+
+	# drop-in replacement for the old synchronous log_print
+	def log_print(self, s):
+		now = time()
+		with self.lock:
+			r = self.recent.get(s)
+			if(r is None or now - r[0] >= self.repeat_window):
+				if(r):
+					self.report(now, s, r)
+				r = self.recent[s] = [now, 0, 0, 0, 0]
+			r[1] += 1
+			if(r[1] > self.repeat_burst):
+				if(not r[2]):
+					r[3] = now
+				r[2] += 1
+				r[4] = now
+				return
+			self.buffer.append((now, s))
+		if(len(self.buffer) >= self.max_buffer):
+			self.wake.set()
+		return
+
+	# called with the lock held
+	def report(self, now, s, r):
+		if(r[2] > 0):
+			self.buffer.append((now, "(message repeated {0} more times from {1} to {2}: {3})".format(r[2],
+				datetime.fromtimestamp(r[3]).strftime('%H:%M:%S'), datetime.fromtimestamp(r[4]).strftime('%H:%M:%S'), s.splitlines()[0] if s else s)))
+			r[2] = 0
+		return
+
+	# counts for windows that are over (or all of them at close), forgets messages with nothing left to report
+	def report_repeats(self, now, closing=False):
+		with self.lock:
+			for s, r in self.recent.items():
+				if(closing or now - r[0] >= self.repeat_window):
+					self.report(now, s, r)
+					del self.recent[s]
+		return
+
+	def rotate(self):
+		for i in xrange(self.backups - 1, 0, -1):
+			fn = '{0}.{1}'.format(self.lfn, i)
+			if(exists(fn)):
+				nfn = '{0}.{1}'.format(self.lfn, i + 1)
+				if(exists(nfn)):
+					remove(nfn)
+				rename(fn, nfn)
+		nfn = self.lfn + '.1'
+		if(exists(nfn)):
+			remove(nfn)
+		rename(self.lfn, nfn)
+		return
+
+	def flush(self):
+		lines = []
+		while(self.buffer):
+			t, s = self.buffer.popleft()
+			# timestamp is taken when the message is logged, not when it is written
+			s = '\t'.join([datetime.fromtimestamp(t).strftime('%Y-%m-%d %H:%M:%S'), s])
+			print s
+			if(not s or s[-1] != '\n'):
+				s += '\n'
+			lines.append(s)
+		if(not lines):
+			return
+		with open(self.lfn, 'a+') as lfh:
+			lfh.write(''.join(lines))
+		if(self.max_bytes > 0 and getsize(self.lfn) > self.max_bytes):
+			self.rotate()
+		return
+
+	def writer(self):
+		while(not self.closed):
+			self.wake.wait(self.flush_interval)
+			self.wake.clear()
+			try:
+				self.report_repeats(time())
+				self.flush()
+			except:
+				# nowhere left to report logging errors, drop the batch but keep the writer alive
+				pass
+		return
+
+	def close(self):
+		if(self.closed):
+			return
+		self.closed = True
+		self.report_repeats(time(), True)
+		self.wake.set()
+		self.thread.join(self.flush_interval*2)
+		self.flush()
+		return
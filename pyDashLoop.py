@@ -0,0 +1,153 @@
+"""
+pyDashLoop.py - Event loop for the pyDash background tasks
+by Dan Allongo (daniel.s.allongo@gmail.com)
+
+Periodic tasks (sim process watch, settings file watch, ...) are kept in
+one heap ordered by absolute deadline instead of each having its own
+polling loop. pyDash runs the loop while waiting for a sim, the game loops
+call run_pending() once per sample so the same tasks keep running on the
+game loop's timeline. A task is never run again while it is still running
+and a late task runs once, not once for every period it missed.
+
+Blocking calls (HID writes) are handed to a latestWorker thread, which
+only ever runs the newest request so a slow device cannot build a backlog.
+
+Release History:
+2026-10-19: Initial release
+"""
+
+from heapq import heappush, heappop
+from threading import Thread, Condition
+from time import sleep
+from os.path import getmtime
+from traceback import format_exc
+from pyDashMetrics import timer
+
+class task:
+	def __init__(self, name, fn, period, deadline):
+		self.name = name
+		self.fn = fn
+		self.period = period
+		self.deadline = deadline
+		self.cancelled = False
+
+	def cancel(self):
+		self.cancelled = True
+		return
+
+class eventLoop:
+	def __init__(self, log_print=None, metrics=None):
+		self.log_print = log_print
+		self.metrics = metrics
+		self.heap = []
+		# tie breaker so tasks with the same deadline run in the order they were added
+		self.order = 0
+		self.running = False
+
+	def add(self, t):
+		self.order += 1
+		heappush(self.heap, (t.deadline, self.order, t))
+		return t
+
+	# run 'fn' every 'period' seconds, the first time after 'delay'
+	def every(self, period, fn, delay=0, name=None):
+		return self.add(task(name or fn.__name__, fn, period, timer() + delay))
+
+	def after(self, delay, fn, name=None):
+		return self.add(task(name or fn.__name__, fn, 0, timer() + delay))
+
+	# run every task that is due, returns the time until the next one
+	def run_pending(self, now=None):
+		if(now is None):
+			now = timer()
+		while(self.heap and self.heap[0][0] <= now):
+			d, o, t = heappop(self.heap)
+			if(t.cancelled):
+				continue
+			try:
+				t.fn()
+			except:
+				if(self.log_print):
+					self.log_print("Task {0} failed!".format(t.name))
+					self.log_print(format_exc())
+				if(self.metrics):
+					self.metrics.count('task_errors')
+			if(t.period > 0 and not t.cancelled):
+				# next deadline on the original grid, skipping any that have already passed
+				t.deadline += t.period*max(1, int((timer() - t.deadline)/t.period) + 1)
+				self.add(t)
+		if(self.heap):
+			return max(self.heap[0][0] - timer(), 0)
+		return None
+
+	def run(self):
+		self.running = True
+		while(self.running):
+			wait = self.run_pending()
+			if(wait is None):
+				break
+			sleep(wait)
+		return
+
+	def stop(self):
+		self.running = False
+		return
+
+# polled by an eventLoop task, the owner takes the change when it is ready for it
+class fileWatch:
+	def __init__(self, fn):
+		self.fn = fn
+		self.changed = False
+		self.sync()
+
+	def sync(self):
+		try:
+			self.mtime = getmtime(self.fn)
+		except OSError:
+			self.mtime = 0
+		return
+
+	def poll(self):
+		try:
+			if(getmtime(self.fn) > self.mtime):
+				self.changed = True
+		except OSError:
+			pass
+		return
+
+	def take(self):
+		if(not self.changed):
+			return False
+		self.changed = False
+		return True
+
+# runs blocking calls on its own thread, a request that has not started yet is replaced by a newer one
+class latestWorker:
+	def __init__(self, name, metrics=None):
+		self.metrics = metrics
+		self.pending = None
+		self.cv = Condition()
+		t = Thread(target=self.work, name=name)
+		t.daemon = True
+		t.start()
+
+	def submit(self, fn, *args):
+		with self.cv:
+			if(self.pending and self.metrics):
+				self.metrics.count('superseded_writes')
+			self.pending = (fn, args)
+			self.cv.notify()
+		return
+
+	def work(self):
+		while(True):
+			with self.cv:
+				while(not self.pending):
+					self.cv.wait()
+				fn, args = self.pending
+				self.pending = None
+			try:
+				fn(*args)
+			except:
+				if(self.metrics):
+					self.metrics.count('worker_errors')
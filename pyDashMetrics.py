@@ -0,0 +1,115 @@
+"""
+pyDashMetrics.py - Collects run-time statistics for pyDash and serves them over local HTTP
+by Dan Allongo (daniel.s.allongo@gmail.com)
+
+The telemetry loop only ever stores numbers into pre-allocated containers.
+Percentiles and JSON encoding are done on the HTTP server thread when a
+monitoring tool asks for them, so scraping never blocks the dashboard.
+
+GET / (or /metrics) returns a JSON object with loop rate, per-stage latency
+percentiles (milliseconds), counters and gauges (current game/session).
+
+Release History:
+2026-10-19: Initial release
+"""
+
+from threading import Thread
+from BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
+from sys import platform
+from time import time, clock
+import json
+
+# time.clock() is the high resolution wall clock on Windows only
+if(platform == 'win32'):
+	timer = clock
+else:
+	timer = time
+
+# fixed-size ring of latency samples in seconds
+class latencyRing:
+	def __init__(self, size=512):
+		self.size = size
+		self.samples = [0.0]*size
+		self.count = 0
+
+	def add(self, v):
+		self.samples[self.count % self.size] = v
+		self.count += 1
+		return
+
+	def percentiles(self, pct=[50, 90, 99]):
+		n = min(self.count, self.size)
+		if(not n):
+			return {}
+		s = sorted(self.samples[:n])
+		return dict([('p{0}'.format(p), round(s[min(n - 1, int(n*p/100.0))]*1000, 3)) for p in pct] +
+			[('max', round(s[-1]*1000, 3)), ('samples', self.count)])
+
+class dashMetrics:
+	def __init__(self):
+		self.started = time()
+		self.stages = {}
+		self.counters = {}
+		self.gauges = {}
+		self.last_tick = 0
+		self.period = 0
+		self.server = None
+
+	# called once per loop iteration, keeps a moving average of the loop period
+	def tick(self, now):
+		if(self.last_tick > 0):
+			dt = now - self.last_tick
+			if(self.period > 0):
+				self.period += (dt - self.period)*0.05
+			else:
+				self.period = dt
+		self.last_tick = now
+		return
+
+	def stage(self, name, dt):
+		if(name not in self.stages):
+			self.stages[name] = latencyRing()
+		self.stages[name].add(dt)
+		return
+
+	def count(self, name, n=1):
+		self.counters[name] = self.counters.get(name, 0) + n
+		return
+
+	def set(self, name, value):
+		self.gauges[name] = value
+		return
+
+	def snapshot(self):
+		o = {'uptime':round(time() - self.started, 1),
+			'loop_hz':round(1/self.period, 1) if self.period > 0 else 0,
+			'counters':dict(self.counters),
+			'gauges':dict(self.gauges),
+			'latency_ms':{}}
+		for k, v in self.stages.items():
+			o['latency_ms'][k] = v.percentiles()
+		return o
+
+	# start HTTP server on a daemon thread
+	def serve(self, port=8089, remote=False):
+		metrics = self
+		class handler(BaseHTTPRequestHandler):
+			def do_GET(self):
+				if(self.path.split('?')[0] not in ['/', '/metrics']):
+					self.send_error(404)
+					return
+				body = json.dumps(metrics.snapshot(), sort_keys=True)
+				self.send_response(200)
+				self.send_header('Content-Type', 'application/json')
+				self.send_header('Content-Length', str(len(body)))
+				self.end_headers()
+				self.wfile.write(body)
+				return
+			# keep request logging out of the console
+			def log_message(self, *args):
+				return
+		self.server = HTTPServer(('0.0.0.0' if remote else '127.0.0.1', int(port)), handler)
+		t = Thread(target=self.server.serve_forever, name='pyDashMetrics')
+		t.daemon = True
+		t.start()
+		return self.server.server_address
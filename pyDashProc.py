@@ -0,0 +1,96 @@
+"""
+pyDashProc.py - Finds a running sim and signals when it exits
+by Dan Allongo (daniel.s.allongo@gmail.com)
+
+procWatch only asks for the name of PIDs it has not seen before, so each scan
+costs one pids() call once the process table has been looked at. The returned
+simProcess waits for the sim to exit on its own thread and sets an Event,
+so the game loops only check a flag instead of calling pid_exists() each tick.
+
+instance_lock() takes an exclusive lock on a file in the working directory,
+the OS drops it when the process exits (even on a crash) so a stale lock
+file never blocks the next start.
+
+Release History:
+2026-10-19: Initial release
+"""
+
+from threading import Thread, Event
+from time import sleep
+from os import getpid
+from sys import platform
+from psutil import pids, pid_exists, Process, NoSuchProcess
+if(platform == 'win32'):
+	from msvcrt import locking, LK_NBLCK
+else:
+	from fcntl import lockf, LOCK_EX, LOCK_NB
+
+# returns (lock file handle, None) or (None, pid of instance holding the lock)
+def instance_lock(lfn):
+	lfh = open(lfn, 'a+')
+	try:
+		if(platform == 'win32'):
+			# lock a byte past the pid so other instances can still read it
+			lfh.seek(64)
+			locking(lfh.fileno(), LK_NBLCK, 1)
+		else:
+			lockf(lfh, LOCK_EX | LOCK_NB, 1, 64)
+	except (IOError, OSError):
+		lfh.seek(0)
+		pid = lfh.read(16).strip()
+		lfh.close()
+		return None, pid or '?'
+	lfh.truncate(0)
+	lfh.write(str(getpid()))
+	lfh.flush()
+	return lfh, None
+
+class simProcess:
+	def __init__(self, pid, name):
+		self.pid = pid
+		self.name = name
+		self.exited = Event()
+		t = Thread(target=self.wait, name='pyDashProc-{0}'.format(pid))
+		t.daemon = True
+		t.start()
+
+	def wait(self):
+		try:
+			Process(self.pid).wait()
+		except NoSuchProcess:
+			pass
+		except:
+			# no handle on the process (ie, sim running as Administrator), fall back to polling
+			while(pid_exists(self.pid)):
+				sleep(1)
+		self.exited.set()
+		return
+
+	def running(self):
+		return not self.exited.is_set()
+
+class procWatch:
+	def __init__(self, names):
+		self.names = [n.lower() for n in names]
+		# pids already looked at and pid -> simProcess for matching names
+		self.seen = set()
+		self.matches = {}
+
+	def find(self):
+		live = set(pids())
+		self.seen &= live
+		for pid, sim in self.matches.items():
+			if(pid not in live or not sim.running()):
+				del self.matches[pid]
+		for pid in live - self.seen:
+			try:
+				name = Process(pid).name()
+			except:
+				# not readable yet (ie, still starting up), try again on the next scan
+				continue
+			self.seen.add(pid)
+			if(name.lower() in self.names):
+				self.matches[pid] = simProcess(pid, name)
+		for sim in self.matches.values():
+			return sim
+		return None
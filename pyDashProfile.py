@@ -0,0 +1,173 @@
+"""
+pyDashProfile.py - Per-car RPM profiles learned while driving, kept between sessions
+by Dan Allongo (daniel.s.allongo@gmail.com)
+
+Each car gets its own profile, keyed by the R3E model id or the rFactor
+vehicle name (so it is learned per car model, not shared across a class).
+A profile records what the car does rather than where the driver shifts:
+	peak: highest fraction of max RPM held for 'hold' seconds without rising
+		more than 'rise' or dropping more than 'band' (the limiter cutting in,
+		a steady climb keeps rising), not counting the first 'settle' seconds after
+		a gear change (downshift over-revs) or the highest gear seen so far
+		(top speed at full throttle is not the limiter)
+	ratio: average RPM after an upshift over the RPM before it (the gearing)
+Once enough upshifts have been seen the shift point is settings['rpm']['shift']
+of the learned peak, the RPM LEDs span from where the RPM lands after that
+shift up to the peak. Both are clamped to the validated settings ranges.
+Until then, or with settings['rpm']['learn'] off (the default), the global
+settings['rpm'] values are used.
+
+Profiles are stored as a JSON object indexed by car key in
+pyDash.profiles.json and loaded when a session starts. The mapping from
+fraction of max RPM to RPM LED value is pre-computed into a table per
+number of LED groups whenever a learned value moves by 'min_change'.
+
+Release History:
+2026-10-19: Initial release
+	Learn the limiter and gearing instead of the driver's shift points, clamp to the settings ranges
+	Limiter is learned from RPM held for a time, recompile only on meaningful changes
+"""
+
+import json
+
+class rpmProfiles:
+	# table resolution in fraction of max RPM
+	resolution = 0.002
+	# upshifts needed before a learned profile is used
+	min_upshifts = 3
+	# seconds after a gear change before the RPM counts towards the peak
+	settle = 0.5
+	# the limiter holds the RPM for at least 'hold' seconds, bouncing down by up to 'band' but never rising by more than 'rise'
+	band = 0.03
+	rise = 0.005
+	hold = 0.3
+	# learned values have to move this much before the tables are computed again
+	min_change = 0.005
+	# validated settings ranges, 'shift' and the LED window (up to 3 groups of 'range')
+	shift_range = (0.85, 1.0)
+	span_range = (0.05, 0.99)
+
+	def __init__(self, pfn, settings, log_print=None):
+		self.pfn = pfn
+		self.log_print = log_print
+		self.profiles = {}
+		self.key = None
+		self.profile = None
+		self.compiled = None
+		self.dirty = False
+		try:
+			with open(pfn, 'r') as f:
+				self.profiles = json.load(f)
+		except (IOError, ValueError):
+			self.profiles = {}
+		self.configure(settings)
+
+	def configure(self, settings):
+		self.settings = settings['rpm']
+		self.compile()
+		return
+
+	# switch to the profile for the car, learning from scratch if it is a new one
+	def select(self, game, car):
+		if((game, car) == self.key):
+			return
+		self.save()
+		self.key = (game, car)
+		key = '{0}/{1}'.format(game, car)
+		# profiles learned from shift points by earlier versions start over
+		if('ratio' not in self.profiles.get(key, {})):
+			self.profiles[key] = {'peak':0.0, 'ratio':0.0, 'upshifts':0}
+		self.profile = self.profiles[key]
+		self.last_gear = 0
+		self.last_value = 0
+		self.gear_time = 0
+		self.hold_start = None
+		self.hold_rpm = 0
+		self.hold_top = 0
+		self.compile()
+		if(self.log_print and self.learned()):
+			self.log_print("RPM profile for {0}: {1:.1%}-{2:.1%}, shift at {3:.1%}".format(key, self.low, self.peak, self.shift))
+		return
+
+	def learned(self):
+		return self.settings['learn'] and self.profile and self.profile['upshifts'] >= self.min_upshifts and self.profile['peak'] > 0
+
+	# LED window and shift point, pre-computes value tables for 1 to 3 groups of RPM LEDs
+	def compile(self):
+		self.peak = 1.0
+		self.shift = self.settings['shift']
+		self.low = None
+		self.compiled = None
+		if(self.learned()):
+			self.compiled = (self.profile['peak'], self.profile['ratio'])
+			self.peak = min(max(self.profile['peak'], self.shift_range[0]), self.shift_range[1])
+			self.shift = min(max(self.peak*self.settings['shift'], self.shift_range[0]), self.shift_range[1])
+			self.low = min(max(self.shift*self.profile['ratio'], self.peak - self.span_range[1]), self.peak - self.span_range[0])
+		self.tables = {}
+		n = int(1/self.resolution) + 1
+		for groups in xrange(1, 4):
+			if(self.low is None):
+				low = 1 - groups*self.settings['range']
+			else:
+				low = self.low
+			span = max(self.peak - low, self.resolution)
+			self.tables[groups] = [min(max((i*self.resolution - low)/span, 0), 1) for i in xrange(n)]
+		return
+
+	# fraction of max RPM to RPM LED value
+	def value(self, rpm, groups):
+		return self.tables[groups][min(max(int(rpm/self.resolution), 0), len(self.tables[groups]) - 1)]
+
+	# tables are only computed again when a learned value moved enough to matter
+	def update(self):
+		if(not self.learned()):
+			return
+		p = self.profile
+		if(self.compiled is None or abs(p['peak'] - self.compiled[0]) >= self.min_change or abs(p['ratio'] - self.compiled[1]) >= self.min_change):
+			self.compile()
+		return
+
+	# called with every sample while driving, 'rpm' is the fraction of max RPM
+	def observe(self, now, rpm, gear):
+		p = self.profile
+		if(p is None or not self.settings['learn']):
+			return
+		if(gear != self.last_gear):
+			self.gear_time = now
+			self.hold_start = None
+		p['top_gear'] = max(p.get('top_gear', 0), gear)
+		if(0 < gear < p['top_gear'] and now - self.gear_time >= self.settle and self.shift_range[0] <= rpm <= 1):
+			if(self.hold_start is None or rpm > self.hold_rpm + self.rise or rpm < self.hold_rpm - self.band):
+				self.hold_start = now
+				self.hold_rpm = rpm
+				self.hold_top = rpm
+			else:
+				self.hold_top = max(self.hold_top, rpm)
+				if(now - self.hold_start >= self.hold and self.hold_top > p['peak']):
+					p['peak'] = self.hold_top
+					self.dirty = True
+					self.update()
+		else:
+			self.hold_start = None
+		# upshift, RPM after the change relative to before depends only on the gearing
+		if(gear > self.last_gear and self.last_gear > 0 and self.last_value > rpm > 0):
+			n = p['upshifts']
+			p['ratio'] = (p['ratio']*n + rpm/self.last_value)/(n + 1)
+			p['upshifts'] = n + 1
+			self.dirty = True
+			self.update()
+		self.last_gear = gear
+		self.last_value = rpm
+		return
+
+	def save(self):
+		if(not self.dirty):
+			return
+		try:
+			with open(self.pfn, 'w') as f:
+				json.dump(self.profiles, f, indent=4, separators=(',',': '), sort_keys=True)
+			self.dirty = False
+		except IOError:
+			if(self.log_print):
+				self.log_print("Unable to save RPM profiles to {0}".format(self.pfn))
+		return
@@ -9,6 +9,25 @@ to display basic telemetry and status data on the dashboard.
 It uses mmap to read from a shared memory handle.
 
 Release History:
+2026-10-19: Report loop rate, stage latency and skipped frames to pyDash metrics
+	Sim exit signalled by pyDash process watcher instead of pid_exists() each tick
+	Fixed-rate scheduler replaces sleep(0.01), display rendered at its own rate
+	Blink effects evaluated from compiled timelines against one frame timestamp
+	Formatted values taken from the srd9c segment cache
+	Info text pages looked up from a table compiled at settings load
+	Tire temperature monitor with status LED warning and info page
+	Fuel averaging moved to pyDashFuel, adds fuel to finish/fuel to add info page
+	SRD-9c buttons call up info pages and acknowledge warnings
+	Shift light lit ahead of time by predicted RPM, optional RPM bar smoothing
+	RPM LED window and shift point learned per car, RPM LEDs mapped from a pre-computed table
+	Session changes detected from a fingerprint of the raw shared memory bytes
+	Shared memory copied through a torn read check, only active driver entries are copied
+	Normalized snapshot republished to the pyDash telemetry bus when enabled
+	Shared memory optionally sampled by a separate reader process
+	Settings file watched by a pyDash event loop task, background tasks run once per sample
+	Black box of recent telemetry written out on critical warnings and unhandled exceptions
+	Per-lap channel statistics logged at the end of each lap
+	Optional recording of the shared memory with a lap/sector/pit index
 2016-06-26: Allow display up to 9th gear
 2016-05-31: Fix array index type error (float instead of int) for fuel array slicing
 2016-05-30: Weighted moving average used for fuel estimates and temperature averages
@@ -41,27 +60,61 @@ Release History:
 """
 
 from traceback import format_exc
-from time import sleep, time
 from mmap import mmap
-from os.path import getmtime
 from pyR3E import *
-from psutil import pid_exists
+from pyDashMetrics import timer
+from pyDashSched import frameScheduler
+from pyDashAnim import dashAnim
+from pyDashInfo import infoPhases
+from pyDashTires import tireMonitor, r3e_tires, corners
+from pyDashFuel import fuelStrategy, laps_remaining
+from pyDashInput import dashInput
+from pyDashShift import shiftPredictor
+from pyDashProfile import rpmProfiles
+from pyDashSession import sessionFingerprint
+from pyDashRead import snapshotReader
+from pyDashSplit import splitSource
+from pyDashLoop import eventLoop, fileWatch
+from pyDashBus import dashFrame, r3e_frame
+from pyDashBlackBox import blackBox
+from pyDashLaps import lapStats
+from pyDashRec import sessionRecorder
 
-def pyDashR3E(pid, log_print, read_settings, dash):
+def pyDashR3E(sim, log_print, read_settings, dash, metrics, bus=None, tasks=None):
+	# created inside the try, checked in finally in case start-up fails part way
+	box = None
+	sched = None
+	watch_task = None
+	profiles = None
+	recorder = None
+	reader = None
+	r3e_smm_handle = None
 	try:
 		log_print("-"*16 + " R3E INIT " + "-"*16)
 		settings, settings_fn = read_settings()
-		settings_mtime = getmtime(settings_fn)
+		if(tasks is None):
+			tasks = eventLoop(log_print, metrics)
+		settings_watch = fileWatch(settings_fn)
+		watch_task = tasks.every(0.5, settings_watch.poll, name='settings')
+		sched = frameScheduler(settings['timing'], metrics)
+		anim = dashAnim(settings)
+		info = infoPhases(settings)
+		tires = tireMonitor(settings)
+		fuel = fuelStrategy(settings)
+		buttons = dashInput(settings, dash, metrics)
+		shift = shiftPredictor(settings)
+		frame = dashFrame()
+		box = blackBox(settings_fn.replace('.settings.json', '.blackbox'), settings, log_print, metrics)
+		laps = lapStats(settings_fn.replace('.settings.json', '.laps.json'), settings, log_print)
+		recorder = sessionRecorder(settings_fn.replace('.settings.json', ''), 'r3e', settings, log_print)
+		profiles = rpmProfiles(settings_fn.replace('.settings.json', '.profiles.json'), settings, log_print)
 		# variables
-		blink_time = {'led':0, 'text':0}
 		compare_lap = 0
 		compare_sector = 0
 		info_text_time = 0
 		current_sector = 0
-		samples = {'water':[], 'oil':[], 'fuel':[], 
-			'avg_water':None, 'avg_oil':None, 'avg_fuel':None}
-		compare_fuel = 0
-		current_session = []
+		samples = {'water':[], 'oil':[], 'avg_water':None, 'avg_oil':None}
+		session = sessionFingerprint(r3e_shared, ['session_type', 'track_info.track_id', 'track_info.layout_id'])
 		print_info = True
 		try:
 			r3e_smm_handle = mmap(fileno=0, length=sizeof(r3e_shared), tagname=r3e_smm_tag)
@@ -70,23 +123,50 @@ def pyDashR3E(pid, log_print, read_settings, dash):
 			log_print(format_exc())
 		if(r3e_smm_handle):
 			log_print("Shared memory mapped!")
+			metrics.set('game', 'r3e')
+			if(settings['timing']['split']):
+				# sampled by a separate process into a ring, the newest snapshot is used
+				reader = splitSource(r3e_shared, r3e_smm_tag, ['player.game_simulation_ticks'], 'all_drivers_data_1', 'num_cars', settings['timing'], metrics, log_print)
+			else:
+				# retried when the game updates the block while it is being copied
+				reader = snapshotReader(r3e_smm_handle, r3e_shared, ['player.game_simulation_ticks'], 'all_drivers_data_1', 'num_cars', metrics)
 		else:
 			log_print("Shared memory not available, exiting!")
 			return
-		while(pid_exists(pid)):
-			sleep(0.01)
+		while(sim.running()):
+			now = sched.wait()
+			metrics.tick(now)
+			tasks.run_pending(now)
 			# get settings if file has changed
-			if(not settings or getmtime(settings_fn) > settings_mtime):
+			if(settings_watch.take()):
 				log_print("Reading settings from {0}".format(settings_fn))
 				settings = read_settings()[0]
-				settings_mtime = getmtime(settings_fn)
+				# ignore the validated settings being written back
+				settings_watch.sync()
+				sched.configure(settings['timing'])
+				anim.compile(settings)
+				info.compile(settings)
+				tires.configure(settings)
+				fuel.configure(settings)
+				buttons.configure(settings)
+				shift.configure(settings)
+				profiles.configure(settings)
+				box.configure(settings)
+				laps.configure(settings)
+				recorder.configure(settings)
+				metrics.count('settings_reload')
+			# button presses queued by the SRD-9c input handler
+			buttons.poll(now, info, anim)
 			# read shared memory block
-			r3e_smm_handle.seek(0)
-			smm = r3e_shared.from_buffer_copy(r3e_smm_handle)
+			t_read = timer()
+			reader.read()
+			smm = reader.smm
+			t_logic = timer()
+			metrics.stage('read', t_logic - t_read)
 			# get driver data
 			dd = None
 			if(smm.num_cars > 0):
-				if([smm.session_type, smm.track_info.track_id, smm.track_info.layout_id] == current_session):
+				if(not session.changed(reader.buffer)):
 					for d in smm.all_drivers_data_1:
 						if(d.driver_info.slot_id == smm.slot_id):
 							dd = d
@@ -98,13 +178,16 @@ def pyDashR3E(pid, log_print, read_settings, dash):
 					compare_sector = 0
 					info_text_time = 0
 					current_sector = 0
-					samples = {'water':[], 'oil':[], 'fuel':[], 
-						'avg_water':None, 'avg_oil':None, 'avg_fuel':None}
-					compare_fuel = 0
-					current_session = [smm.session_type, smm.track_info.track_id, smm.track_info.layout_id]
+					samples = {'water':[], 'oil':[], 'avg_water':None, 'avg_oil':None}
+					fuel.reset()
+					shift.reset()
+					laps.reset()
+					recorder.session()
+					metrics.set('session', session.decode(smm))
 					print_info = True
+					tires.reset()
 			else:
-				current_session = []
+				session.reset()
 			if(dd):
 				# use green RPM LEDs for PTP when available
 				if((smm.push_to_pass.amount_left > 0 or smm.push_to_pass.engaged > -1 or smm.drs_engaged > 0 or 
@@ -114,51 +197,44 @@ def pyDashR3E(pid, log_print, read_settings, dash):
 				elif((smm.push_to_pass.available < 1 and smm.push_to_pass.engaged < 1) or (smm.drs_engaged == 0 and smm.drs_available == 0) or not settings['drs_ptp']['led']):
 					dash.rpm['use_green'] = True
 				# used by the blink timers (all things that blink do so in unison)
-				if(time() - blink_time['led'] >= settings['led_blink']['duration']*2):
-					blink_time['led'] = time()
-				if(time() - blink_time['text'] >= settings['text_blink']['duration']*2):
-					blink_time['text'] = time()
+				anim.tick(now)
+				# tires are sampled at a reduced rate, results are cached in between
+				if(tires.due(now) and tires.update(now, *(r3e_tires(smm) + (smm.completed_laps,)))):
+					log_print("Tire baseline: {0}".format(' '.join(['{0} {1:4.1f} C {2:5.1f} kPa'.format(*c) for c in zip(corners, tires.baseline, tires.baseline_pressure)])))
 				rpm = 0
 				status = ['0']*4
 				if(smm.max_engine_rps > 0):
-					rpm = smm.engine_rps/smm.max_engine_rps
-					rpm -= (1 - (int(dash.rpm['use_green']) + int(dash.rpm['use_red']) + int(dash.rpm['use_blue']))*settings['rpm']['range'])
-					rpm /= (int(dash.rpm['use_green']) + int(dash.rpm['use_red']) + int(dash.rpm['use_blue']))*settings['rpm']['range']
-					if(rpm < 0):
-						rpm = 0
-					# blue status LED shift light at 95% of full RPM range
-					if(smm.engine_rps/smm.max_engine_rps >= settings['rpm']['shift']):
+					shift.update(now, smm.engine_rps/smm.max_engine_rps)
+					profiles.select('r3e', dd.driver_info.model_id)
+					profiles.observe(now, shift.value, smm.gear)
+					rpm = profiles.value(shift.smoothed, int(dash.rpm['use_green']) + int(dash.rpm['use_red']) + int(dash.rpm['use_blue']))
+					# blue status LED shift light at 95% of full RPM range (or learned shift point), compensated for display latency
+					if(shift.shift(profiles.shift)):
 						status[2] = '1'
 				dash.rpm['value'] = rpm
 				dash.gear = dict({'-2':'-', '-1':'r', '0':settings['neutral']['symbol']}, **{str(i):str(i) for i in range(1, 10)})[str(smm.gear)]
 				if(settings['speed']['units'] == 'mph'):
-					dash.right = '{0}'.format(int(mps_to_mph(smm.car_speed)))
+					dash.right = dash.cache.format(int(mps_to_mph(smm.car_speed)), '{0}')
 				elif(settings['speed']['units'] == 'km/h'):
-					dash.right = '{0}'.format(int(mps_to_kph(smm.car_speed)))
+					dash.right = dash.cache.format(int(mps_to_kph(smm.car_speed)), '{0}')
 				# no running clock on invalid/out laps
 				if(smm.lap_time_current_self > 0):
-					dash.left = '{0:01.0f}.{1:04.1f}'.format(*divmod(smm.lap_time_current_self, 60))
+					dash.left = dash.cache.format(divmod(round(smm.lap_time_current_self, 1), 60), '{0:01.0f}.{1:04.1f}')
 				else:
 					dash.left = '-.--.-'
 				# info text timer starts upon entering each sector
 				if(current_sector != dd.track_sector):
-					info_text_time = time()
+					info_text_time = now
 					current_sector = dd.track_sector
 					print_info = True
 					# calculate fuel use average continuously (dimishes over time) and ignore first sector after refuel
 					if(settings['fuel']['enabled'] and smm.fuel_use_active == 1):
-						if(compare_fuel > 0 and compare_fuel > smm.fuel_left):
-							samples['fuel'].append(compare_fuel - smm.fuel_left)
-							if(len(samples['fuel']) > 3*settings['fuel']['samples']):
-								samples['fuel'] = samples['fuel'][int(-3*settings['fuel']['samples']):]
-								wn = 0
-								wd = 0
-								for i in xrange(0,len(samples['fuel'])):
-									wn += samples['fuel'][i]*(i+1)
-									wd += (i+1)
-								samples['avg_fuel'] = wn*3/wd
-								log_print("Average fuel use: {0:4.2f} L per lap".format(samples['avg_fuel']))
-						compare_fuel = smm.fuel_left
+						if(fuel.sector(smm.fuel_left)):
+							log_print("Average fuel use: {0:4.2f} L per lap".format(fuel.avg))
+						# fuel strategy only changes once per sector
+						fuel.plan(smm.fuel_left, laps_remaining(smm.number_of_laps, smm.completed_laps, smm.session_time_remaining, 
+							smm.lap_time_best_self if smm.lap_time_best_self > 0 else smm.lap_time_previous_self,
+							dd.lap_distance/smm.track_info.length if smm.track_info.length > 0 else 0), smm.fuel_capacity)
 					# calculate temps for first few laps as baseline
 					if(settings['temperature']['enabled']):
 						if(len(samples['water']) < 3*settings['temperature']['samples']):
@@ -181,24 +257,24 @@ def pyDashR3E(pid, log_print, read_settings, dash):
 								wd += (i+1)
 							samples['avg_oil'] = wn/wd
 							log_print("Average oil temperature: {0:4.2f} C".format(samples['avg_oil']))
-				if(current_sector == 1):
+				# page picked with the SRD-9c button takes over from the info text
+				page = info.demand(now)
+				if(not page and current_sector == 1):
 					# show lap time compared to last/best/session best lap
-					et = time() - info_text_time
-					et_min = 0
-					et_max = int(settings['info_text']['lap_split']['enabled'])*settings['info_text']['duration']
-					if(et >= et_min and et < et_max and settings['info_text']['lap_split']['enabled']):
+					page = info.page(now - info_text_time)
+					if(page == 'lap_split'):
 						if(smm.lap_time_previous_self > 0):
-							dash.left = '{0:01.0f}.{1:04.1f}'.format(*divmod(smm.lap_time_previous_self, 60))
+							dash.left = dash.cache.format(divmod(round(smm.lap_time_previous_self, 1), 60), '{0:01.0f}.{1:04.1f}')
 						else:
 							dash.left = '-.--.-'
 						if(compare_lap > 0 and smm.lap_time_previous_self > 0):
-							dash.right = '{0:04.2f}'.format(smm.lap_time_previous_self - compare_lap)
+							dash.right = dash.cache.format(round(smm.lap_time_previous_self - compare_lap, 2), '{0:04.2f}')
 						else:
 							dash.right = '--.--'
 						if(print_info):
 							log_print("Lap time (split): {0} ({1})".format(dash.left, dash.right))
 							print_info = False
-					else:
+					elif(info.split_done(now - info_text_time)):
 						# update comparison lap after lap display is done
 						if(smm.lap_time_previous_self > 0 and settings['info_text']['lap_split']['compare_lap'] == 'self_previous'):
 							compare_lap = smm.lap_time_previous_self
@@ -208,24 +284,7 @@ def pyDashR3E(pid, log_print, read_settings, dash):
 							compare_lap = smm.lap_time_best_leader
 						else:
 							compare_lap = 0
-					# show position and number of cars in field
-					et_min += int(settings['info_text']['lap_split']['enabled'])*settings['info_text']['duration']
-					et_max += int(settings['info_text']['position']['enabled'])*settings['info_text']['duration']
-					if(et >= et_min and et < et_max and settings['info_text']['position']['enabled']):
-						dash.left = 'P{0}'.format(str(smm.position).rjust(3))
-						dash.right = ' {0}'.format(str(smm.num_cars).ljust(3))
-					# show completed laps and laps/time remaining
-					et_min += int(settings['info_text']['position']['enabled'])*settings['info_text']['duration']
-					et_max += int(settings['info_text']['remaining']['enabled'])*settings['info_text']['duration']
-					if(et >= et_min and et < et_max and settings['info_text']['remaining']['enabled']):
-						dash.left = 'L{0}'.format(str(smm.completed_laps).rjust(3))
-						if(smm.number_of_laps > 0):
-							dash.right = ' {0}'.format(str(smm.number_of_laps).ljust(3))
-						elif(smm.session_time_remaining > 0):
-							dash.right = '{0:02.0f}.{1:04.1f}'.format(*divmod(smm.session_time_remaining, 60))
-						else:
-							dash.right = ' '*4
-				elif(current_sector in [2, 3] and settings['info_text']['sector_split']['enabled'] and time() - info_text_time <= settings['info_text']['duration']):
+				elif(not page and current_sector in [2, 3] and settings['info_text']['sector_split']['enabled'] and now - info_text_time <= settings['info_text']['duration']):
 					# show sectors 1 and 2 splits
 					if(smm.lap_time_previous_self > 0 and settings['info_text']['sector_split']['compare_lap'] == 'self_previous'):
 						compare_sector = dd.sector_time_previous_self[current_sector - 2]
@@ -245,18 +304,35 @@ def pyDashR3E(pid, log_print, read_settings, dash):
 						sector_delta = dd.sector_time_current_self[current_sector - 2] - compare_sector
 						if(current_sector == 3):
 							sector_delta -= dd.sector_time_current_self[0]
-						dash.right = '{0:04.2f}'.format(sector_delta)
+						dash.right = dash.cache.format(round(sector_delta, 2), '{0:04.2f}')
 					else:
 						dash.right = '--.--'
+				# show position and number of cars in field
+				if(page == 'position'):
+					dash.left = dash.cache.format(smm.position, 'P{0:>3}')
+					dash.right = dash.cache.format(smm.num_cars, ' {0:<3}')
+				# show completed laps and laps/time remaining
+				elif(page == 'remaining'):
+					dash.left = dash.cache.format(smm.completed_laps, 'L{0:>3}')
+					if(smm.number_of_laps > 0):
+						dash.right = dash.cache.format(smm.number_of_laps, ' {0:<3}')
+					elif(smm.session_time_remaining > 0):
+						dash.right = dash.cache.format(divmod(round(smm.session_time_remaining, 1), 60), '{0:02.0f}.{1:04.1f}')
+					else:
+						dash.right = ' '*4
+				# show tire temperatures
+				elif(page == 'tires'):
+					tires.show(dash)
+				# show fuel to add and laps of fuel left
+				elif(page == 'fuel'):
+					fuel.show(dash)
 				# blink red status LED at critical fuel level
-				if(settings['fuel']['enabled'] and samples['avg_fuel'] and smm.fuel_left/samples['avg_fuel'] <= settings['fuel']['warning']):
+				if(settings['fuel']['enabled'] and fuel.avg and smm.fuel_left/fuel.avg <= settings['fuel']['warning']):
 					status[0] = '1'
-					if(smm.fuel_left/samples['avg_fuel'] < settings['fuel']['critical']):
-						if(settings['led_blink']['enabled'] and time() - blink_time['led'] <= settings['led_blink']['duration']):
-							status[0] = '0'
-						else:
-							status[0] = '1'
-						if(settings['text_blink']['enabled'] and time() - blink_time['text'] <= settings['text_blink']['duration']):
+					if(smm.fuel_left/fuel.avg < settings['fuel']['critical']):
+						box.trigger('fuel', now)
+						status[0] = anim['led']
+						if(anim['text']):
 							dash.left = 'fuel'
 				# blink yellow status LED at critical oil/coolant temp
 				if(settings['temperature']['enabled'] and ((samples['avg_water'] and smm.engine_water_temp - samples['avg_water'] >= settings['temperature']['warning']) or
@@ -264,57 +340,88 @@ def pyDashR3E(pid, log_print, read_settings, dash):
 					status[1] = '1'
 					if((smm.engine_water_temp - samples['avg_water'] > settings['temperature']['critical']) or
 						(smm.engine_oil_temp - samples['avg_oil'] > settings['temperature']['critical'])):
-						if(settings['led_blink']['enabled'] and time() - blink_time['led'] <= settings['led_blink']['duration']):
-							status[1] = '0'
-						else:
-							status[1] = '1'
-						if(settings['text_blink']['enabled'] and time() - blink_time['text'] <= settings['text_blink']['duration']):
+						box.trigger('heat', now)
+						status[1] = anim['led']
+						if(anim['text']):
 							dash.left = 'heat'
+				# yellow status LED for tire temperatures away from baseline, blinks when critical
+				if(tires.level == 2):
+					box.trigger('tires', now)
+					status[1] = anim['led']
+				elif(tires.level == 1 and status[1] == '0'):
+					status[1] = '1'
 				# blink green status LED while in pit/limiter active
 				if(smm.pit_window_status == r3e_pit_window.R3E_PIT_WINDOW_OPEN):
 					status[3] = '1'
 				if(smm.pit_window_status == r3e_pit_window.R3E_PIT_WINDOW_STOPPED or smm.pit_limiter == 1):
-					if(settings['led_blink']['enabled'] and time() - blink_time['led'] <= settings['led_blink']['duration']):
-						status[3] = '0'
-					else:
-						status[3] = '1'
-					if(settings['text_blink']['enabled'] and time() - blink_time['text'] <= settings['text_blink']['duration']):
+					status[3] = anim['led']
+					if(anim['text']):
 						dash.right = 'pit '
 				# blink green RPM LED during PTP cool-down, charging effect on last 4 seconds
 				if(not dash.rpm['use_green']):
 					if(smm.push_to_pass.wait_time_left >= 0 and smm.push_to_pass.wait_time_left <= 4):
-						dash.rpm['green'] = ('0'*(int(smm.push_to_pass.wait_time_left))).rjust(4, '1')
+						dash.rpm['green'] = anim.ptp_charging[int(smm.push_to_pass.wait_time_left)]
 					else:
-						if(settings['led_blink']['enabled'] and time() - blink_time['led'] <= settings['led_blink']['duration']):
-							dash.rpm['green'] = '0100'
-						else:
-							dash.rpm['green'] = '1000'
+						dash.rpm['green'] = anim['ptp_wait']
 				# blink green RPM LED during DRS/PTP engaged, depleting effect on last 4 seconds
 				# blink PTP activations remaining on display while PTP engaged
 				if(smm.push_to_pass.engaged == 1 or smm.drs_engaged == 1):
 					if(smm.push_to_pass.engaged_time_left >= 0 and smm.push_to_pass.engaged_time_left <= 4):
-						dash.rpm['green'] = ('1'*(int(smm.push_to_pass.engaged_time_left))).rjust(4, '0')
+						dash.rpm['green'] = anim.ptp_depleting[int(smm.push_to_pass.engaged_time_left)]
 					else:
-						if(settings['led_blink']['enabled'] and time() - blink_time['led'] <= settings['led_blink']['duration']):
-							dash.rpm['green'] = '0110'
-						else:
-							dash.rpm['green'] = '1001'
-						if(settings['drs_ptp']['text'] and time() - blink_time['text'] <= settings['text_blink']['duration']):
+						dash.rpm['green'] = anim['ptp_engaged']
+						if(anim['ptp_text']):
 							dash.left = ' ptp'
 							dash.right = str(smm.push_to_pass.amount_left).ljust(4)
 							if(smm.drs_engaged == 1):
 								dash.left = 'drs '
 								dash.right = ' on '
+			# republish the normalized snapshot for other tools, keep some of it for the black box, lap statistics and recording
+			if(dd and (bus or laps.enabled or recorder.enabled or box.due(now))):
+				r3e_frame(smm, dd, frame)
+				frame.time = now
+				if(bus):
+					bus.publish(frame)
+				box.add(now, frame)
+				laps.add(frame)
+				recorder.add(now, smm, frame)
+			t_hid = timer()
+			metrics.stage('logic', t_hid - t_logic)
+			if(not sched.render_due()):
+				continue
 			# make sure engine is running
 			if(dd and rps_to_rpm(smm.engine_rps) > 1):
 				dash.status = ''.join(status)
-				dash.update()
+				sent = dash.update()
 			else:
-				dash.reset()
+				sent = dash.reset()
+			buttons.displayed(timer(), sent)
+			if(sent):
+				shift.sent(dash.write_time)
+			# with a sender thread 'sent' only means queued, the thread records the write itself
+			if(not dash.sender):
+				if(sent):
+					metrics.stage('hid', timer() - t_hid)
+					metrics.count('frames_sent')
+				else:
+					metrics.count('frames_skipped')
 	except:
 		log_print("Unhandled exception!")
 		log_print(format_exc())
+		if(box):
+			box.trigger('exception')
 	finally:
-		log_print("Closing shared memory map...")
-		r3e_smm_handle.close()
+		if(watch_task):
+			watch_task.cancel()
+		if(sched):
+			sched.close()
+		if(profiles):
+			profiles.save()
+		if(recorder):
+			recorder.close()
+		if(reader):
+			reader.close()
+		if(r3e_smm_handle):
+			log_print("Closing shared memory map...")
+			r3e_smm_handle.close()
 		log_print("-"*16 + " R3E SHUTDOWN " + "-"*16)
@@ -9,6 +9,25 @@ to display basic telemetry and status data on the dashboard.
 It uses mmap to read from a shared memory handle.
 
 Release History:
+2026-10-19: Report loop rate, stage latency and skipped frames to pyDash metrics
+	Sim exit signalled by pyDash process watcher instead of pid_exists() each tick
+	Fixed-rate scheduler replaces sleep(0.01), display rendered at its own rate
+	Blink effects evaluated from compiled timelines against one frame timestamp
+	Formatted values taken from the srd9c segment cache
+	Info text pages looked up from a table compiled at settings load
+	Tire temperature monitor with status LED warning and info page
+	Fuel averaging moved to pyDashFuel, adds fuel to finish/fuel to add info page
+	SRD-9c buttons call up info pages and acknowledge warnings
+	Shift light lit ahead of time by predicted RPM, optional RPM bar smoothing
+	RPM LED window and shift point learned per car, RPM LEDs mapped from a pre-computed table
+	Session changes detected from a fingerprint of the raw shared memory bytes
+	Shared memory copied through a torn read check, only active driver entries are copied
+	Normalized snapshot republished to the pyDash telemetry bus when enabled
+	Shared memory optionally sampled by a separate reader process
+	Settings file watched by a pyDash event loop task, background tasks run once per sample
+	Black box of recent telemetry written out on critical warnings and unhandled exceptions
+	Per-lap channel statistics logged at the end of each lap
+	Optional recording of the shared memory with a lap/sector/pit index
 2016-06-30: Fix display of timing gap for self best lap and self best sector
 	Preliminary support for deleted laps
 2016-06-26: Allow display up to 9th gear
@@ -24,26 +43,60 @@ Release History:
 """
 
 from traceback import format_exc
-from time import sleep, time
 from mmap import mmap
-from os.path import getmtime
 from pyRF1 import *
-from psutil import pid_exists
+from pyDashMetrics import timer
+from pyDashSched import frameScheduler
+from pyDashAnim import dashAnim
+from pyDashInfo import infoPhases
+from pyDashTires import tireMonitor, rf1_tires, corners
+from pyDashFuel import fuelStrategy, laps_remaining
+from pyDashInput import dashInput
+from pyDashShift import shiftPredictor
+from pyDashProfile import rpmProfiles
+from pyDashSession import sessionFingerprint
+from pyDashRead import snapshotReader
+from pyDashSplit import splitSource
+from pyDashLoop import eventLoop, fileWatch
+from pyDashBus import dashFrame, rf1_frame
+from pyDashBlackBox import blackBox
+from pyDashLaps import lapStats
+from pyDashRec import sessionRecorder
 
-def pyDashRF1(pid, log_print, read_settings, dash):
+def pyDashRF1(sim, log_print, read_settings, dash, metrics, bus=None, tasks=None):
+	# created inside the try, checked in finally in case start-up fails part way
+	box = None
+	sched = None
+	watch_task = None
+	profiles = None
+	recorder = None
+	reader = None
+	rfMapHandle = None
 	try:
 		log_print("-"*16 + " RF1 INIT " + "-"*16)
 		settings, settings_fn = read_settings()
-		settings_mtime = getmtime(settings_fn)
+		if(tasks is None):
+			tasks = eventLoop(log_print, metrics)
+		settings_watch = fileWatch(settings_fn)
+		watch_task = tasks.every(0.5, settings_watch.poll, name='settings')
+		sched = frameScheduler(settings['timing'], metrics)
+		anim = dashAnim(settings)
+		info = infoPhases(settings)
+		tires = tireMonitor(settings)
+		fuel = fuelStrategy(settings)
+		buttons = dashInput(settings, dash, metrics)
+		shift = shiftPredictor(settings)
+		frame = dashFrame()
+		box = blackBox(settings_fn.replace('.settings.json', '.blackbox'), settings, log_print, metrics)
+		laps = lapStats(settings_fn.replace('.settings.json', '.laps.json'), settings, log_print)
+		recorder = sessionRecorder(settings_fn.replace('.settings.json', ''), 'rf1', settings, log_print)
+		profiles = rpmProfiles(settings_fn.replace('.settings.json', '.profiles.json'), settings, log_print)
 		# variables
-		blink_time = {'led':0, 'text':0}
 		info_text_time = 0
 		compare_lap = 0
 		compare_sector = 0
 		current_sector = 1
-		samples = {'fuel':[], 'avg_fuel':None}
-		compare_fuel = 0
-		current_session = []
+		session = sessionFingerprint(rfShared, ['session', 'trackName', 'vehicleName'])
 		current_phase = 0
 		print_info = True
 		bestLapTime = 0
@@ -59,23 +112,50 @@ def pyDashRF1(pid, log_print, read_settings, dash):
 			log_print(format_exc())
 		if(rfMapHandle):
 			log_print("Shared memory mapped!")
+			metrics.set('game', 'rf1')
+			if(settings['timing']['split']):
+				# sampled by a separate process into a ring, the newest snapshot is used
+				reader = splitSource(rfShared, rfMapTag, ['deltaTime', 'currentET'], 'vehicle', 'numVehicles', settings['timing'], metrics, log_print)
+			else:
+				# retried when the game updates the block while it is being copied
+				reader = snapshotReader(rfMapHandle, rfShared, ['deltaTime', 'currentET'], 'vehicle', 'numVehicles', metrics)
 		else:
 			log_print("Shared memory not available, exiting!")
 			return
-		while(pid_exists(pid)):
-			sleep(0.01)
+		while(sim.running()):
+			now = sched.wait()
+			metrics.tick(now)
+			tasks.run_pending(now)
 			# get settings if file has changed
-			if(not settings or getmtime(settings_fn) > settings_mtime):
+			if(settings_watch.take()):
 				log_print("Reading settings from {0}".format(settings_fn))
 				settings = read_settings()[0]
-				settings_mtime = getmtime(settings_fn)
+				# ignore the validated settings being written back
+				settings_watch.sync()
+				sched.configure(settings['timing'])
+				anim.compile(settings)
+				info.compile(settings)
+				tires.configure(settings)
+				fuel.configure(settings)
+				buttons.configure(settings)
+				shift.configure(settings)
+				profiles.configure(settings)
+				box.configure(settings)
+				laps.configure(settings)
+				recorder.configure(settings)
+				metrics.count('settings_reload')
+			# button presses queued by the SRD-9c input handler
+			buttons.poll(now, info, anim)
 			# read shared memory block
-			rfMapHandle.seek(0)
-			smm = rfShared.from_buffer_copy(rfMapHandle)
+			t_read = timer()
+			reader.read()
+			smm = reader.smm
+			t_logic = timer()
+			metrics.stage('read', t_logic - t_read)
 			# get driver data
 			dd = None
 			if(smm.numVehicles > 0):
-				if([smm.session, smm.trackName, smm.vehicleName] == current_session and
+				if(not session.changed(reader.buffer) and
 					(smm.gamePhase >= current_phase or 
 					(smm.gamePhase == rfGamePhase.greenFlag and current_phase == rfGamePhase.fullCourseYellow))):
 					for d in smm.vehicle:
@@ -88,10 +168,13 @@ def pyDashRF1(pid, log_print, read_settings, dash):
 					compare_sector = 0
 					info_text_time = 0
 					current_sector = 1
-					samples = {'fuel':[], 'avg_fuel':None}
-					compare_fuel = 0
-					current_session = [smm.session, smm.trackName, smm.vehicleName]
+					fuel.reset()
+					shift.reset()
+					laps.reset()
+					recorder.session()
+					metrics.set('session', session.decode(smm))
 					print_info = True
+					tires.reset()
 					bestLapTime = 0
 					bestSector1 = 0
 					bestSector2 = 0
@@ -99,31 +182,30 @@ def pyDashRF1(pid, log_print, read_settings, dash):
 					bestSector1Session = 0
 					bestSector2Session = 0
 			else:
-				current_session = []
+				session.reset()
 			current_phase = smm.gamePhase
 			if(dd):
 				# used by the blink timers (all things that blink do so in unison)
-				if(time() - blink_time['led'] >= settings['led_blink']['duration']*2):
-					blink_time['led'] = time()
-				if(time() - blink_time['text'] >= settings['text_blink']['duration']*2):
-					blink_time['text'] = time()
+				anim.tick(now)
+				# tires are sampled at a reduced rate, results are cached in between
+				if(tires.due(now) and tires.update(now, *(rf1_tires(smm) + (dd.totalLaps,)))):
+					log_print("Tire baseline: {0}".format(' '.join(['{0} {1:4.1f} C {2:5.1f} kPa'.format(*c) for c in zip(corners, tires.baseline, tires.baseline_pressure)])))
 				rpm = 0
 				status = ['0']*4
 				if(smm.engineMaxRPM > 0):
-					rpm = smm.engineRPM/smm.engineMaxRPM
-					rpm -= (1 - (int(dash.rpm['use_green']) + int(dash.rpm['use_red']) + int(dash.rpm['use_blue']))*settings['rpm']['range'])
-					rpm /= (int(dash.rpm['use_green']) + int(dash.rpm['use_red']) + int(dash.rpm['use_blue']))*settings['rpm']['range']
-					if(rpm < 0):
-						rpm = 0
-					# blue status LED shift light at 95% of full RPM range
-					if(smm.engineRPM/smm.engineMaxRPM >= settings['rpm']['shift']):
+					shift.update(now, smm.engineRPM/smm.engineMaxRPM)
+					profiles.select('rf1', smm.vehicleName)
+					profiles.observe(now, shift.value, smm.gear)
+					rpm = profiles.value(shift.smoothed, int(dash.rpm['use_green']) + int(dash.rpm['use_red']) + int(dash.rpm['use_blue']))
+					# blue status LED shift light at 95% of full RPM range (or learned shift point), compensated for display latency
+					if(shift.shift(profiles.shift)):
 						status[2] = '1'
 				dash.rpm['value'] = rpm
 				dash.gear = dict({'-2':'-', '-1':'r', '0':settings['neutral']['symbol']}, **{str(i):str(i) for i in range(1, 10)})[str(smm.gear)]
 				if(settings['speed']['units'] == 'mph'):
-					dash.right = '{0}'.format(int(mps_to_mph(smm.speed)))
+					dash.right = dash.cache.format(int(mps_to_mph(smm.speed)), '{0}')
 				elif(settings['speed']['units'] == 'km/h'):
-					dash.right = '{0}'.format(int(mps_to_kph(smm.speed)))
+					dash.right = dash.cache.format(int(mps_to_kph(smm.speed)), '{0}')
 				if(smm.currentET > 0 and smm.lapStartET > 0 and smm.lapNumber > 0):
 					currentLapTime = smm.currentET - smm.lapStartET
 				else:
@@ -133,45 +215,40 @@ def pyDashRF1(pid, log_print, read_settings, dash):
 					currentLapTime = 0
 				# no running clock on invalid/out laps
 				if(currentLapTime > 0):
-					dash.left = '{0:01.0f}.{1:04.1f}'.format(*divmod(currentLapTime, 60))
+					dash.left = dash.cache.format(divmod(round(currentLapTime, 1), 60), '{0:01.0f}.{1:04.1f}')
 				else:
 					dash.left = '-.--.-'
 				# info text timer starts upon entering each sector
 				if(current_sector != dd.sector):
-					info_text_time = time()
+					info_text_time = now
 					current_sector = dd.sector
 					print_info = True
 					# calculate fuel use average continuously (dimishes over time) and ignore first sector after refuel
-					if(settings['fuel']['enabled'] and compare_fuel > 0 and compare_fuel > smm.fuel):
-						samples['fuel'].append(compare_fuel - smm.fuel)
-						if(len(samples['fuel']) > 3*settings['fuel']['samples']):
-							samples['fuel'] = samples['fuel'][int(-3*settings['fuel']['samples']):]
-							wn = 0
-							wd = 0
-							for i in xrange(0,len(samples['fuel'])):
-								wn += samples['fuel'][i]*(i+1)
-								wd += (i+1)
-							samples['avg_fuel'] = wn*3/wd
-							log_print("Average fuel use: {0:4.2f} L per lap".format(samples['avg_fuel']))
-					compare_fuel = smm.fuel
-				if(current_sector == 1):
+					if(settings['fuel']['enabled']):
+						if(fuel.sector(smm.fuel)):
+							log_print("Average fuel use: {0:4.2f} L per lap".format(fuel.avg))
+						# fuel strategy only changes once per sector
+						fuel.plan(smm.fuel, laps_remaining(smm.maxLaps if smm.maxLaps < 2000 else 0, dd.totalLaps, 
+							smm.endET - smm.currentET if smm.endET > 0 else 0, dd.bestLapTime if dd.bestLapTime > 0 else dd.lastLapTime,
+							dd.lapDist/smm.lapDist if smm.lapDist > 0 else 0))
+				# page picked with the SRD-9c button takes over from the info text
+				page = info.demand(now)
+				if(not page and current_sector == 1):
 					# show lap time compared to last/best/session best lap
-					et = time() - info_text_time
-					et_min = 0
-					et_max = int(settings['info_text']['lap_split']['enabled'])*settings['info_text']['duration']
-					if(et >= et_min and et < et_max and settings['info_text']['lap_split']['enabled']):
+					page = info.page(now - info_text_time)
+					if(page == 'lap_split'):
 						if(dd.lastLapTime > 0):
-							dash.left = '{0:01.0f}.{1:04.1f}'.format(*divmod(dd.lastLapTime, 60))
+							dash.left = dash.cache.format(divmod(round(dd.lastLapTime, 1), 60), '{0:01.0f}.{1:04.1f}')
 						else:
 							dash.left = '-.--.-'
 						if(compare_lap > 0 and dd.lastLapTime > 0):
-							dash.right = '{0:04.2f}'.format(dd.lastLapTime - compare_lap)
+							dash.right = dash.cache.format(round(dd.lastLapTime - compare_lap, 2), '{0:04.2f}')
 						else:
 							dash.right = '--.--'
 						if(print_info):
 							log_print("Lap time (split): {0} ({1})".format(dash.left, dash.right))
 							print_info = False
-					else:
+					elif(info.split_done(now - info_text_time)):
 						# update comparison lap after lap display is done
 						if(dd.lastLapTime > 0 and settings['info_text']['lap_split']['compare_lap'] == 'self_previous'):
 							compare_lap = dd.lastLapTime
@@ -181,24 +258,7 @@ def pyDashRF1(pid, log_print, read_settings, dash):
 							compare_lap = bestLapTimeSession
 						else:
 							compare_lap = 0
-					# show position and number of cars in field
-					et_min += int(settings['info_text']['lap_split']['enabled'])*settings['info_text']['duration']
-					et_max += int(settings['info_text']['position']['enabled'])*settings['info_text']['duration']
-					if(et >= et_min and et < et_max and settings['info_text']['position']['enabled']):
-						dash.left = 'P{0}'.format(str(dd.place).rjust(3))
-						dash.right = ' {0}'.format(str(smm.numVehicles).ljust(3))
-					# show completed laps and laps/time remaining
-					et_min += int(settings['info_text']['position']['enabled'])*settings['info_text']['duration']
-					et_max += int(settings['info_text']['remaining']['enabled'])*settings['info_text']['duration']
-					if(et >= et_min and et < et_max and settings['info_text']['remaining']['enabled']):
-						dash.left = 'L{0}'.format(str(dd.totalLaps).rjust(3))
-						if(smm.maxLaps > 0 and smm.maxLaps < 2000):
-							dash.right = ' {0}'.format(str(smm.maxLaps).ljust(3))
-						elif(smm.endET > 0):
-							dash.right = '{0:02.0f}.{1:04.1f}'.format(*divmod(smm.endET - smm.currentET, 60))
-						else:
-							dash.right = ' '*4
-				elif(current_sector in [2, 0] and settings['info_text']['sector_split']['enabled'] and time() - info_text_time <= settings['info_text']['duration']):
+				elif(not page and current_sector in [2, 0] and settings['info_text']['sector_split']['enabled'] and now - info_text_time <= settings['info_text']['duration']):
 					# show sectors 1 and 2 splits
 					compare_sector = 0
 					if(settings['info_text']['sector_split']['compare_lap'] == 'self_previous'):
@@ -218,13 +278,13 @@ def pyDashRF1(pid, log_print, read_settings, dash):
 							compare_sector = bestSector2Session - bestSector1Session
 					if(compare_sector > 0 and current_sector == 2 and currentLapTime > 0 and dd.curSector1 > 0):
 						sector_delta = dd.curSector1 - compare_sector
-						dash.right = '{0:04.2f}'.format(sector_delta)
+						dash.right = dash.cache.format(round(sector_delta, 2), '{0:04.2f}')
 					elif(compare_sector > 0 and current_sector == 0 and currentLapTime > 0 and dd.curSector1 > 0 and dd.curSector2 > 0):
 						sector_delta = (dd.curSector2 - dd.curSector1) - compare_sector
-						dash.right = '{0:04.2f}'.format(sector_delta)
+						dash.right = dash.cache.format(round(sector_delta, 2), '{0:04.2f}')
 					else:
 						dash.right = '--.--'
-				else:
+				elif(not page):
 					# update best sectors after delta display to avoid displaying '0.00' when setting new best
 					bestLapTime = dd.bestLapTime
 					bestSector1 = dd.bestSector1
@@ -236,44 +296,98 @@ def pyDashRF1(pid, log_print, read_settings, dash):
 							bestSector1Session = d.bestSector1
 						if(d.bestSector2 > 0 and (bestSector2Session == 0 or d.bestSector2 < bestSector2Session)):
 							bestSector2Session = d.bestSector2
+				# show position and number of cars in field
+				if(page == 'position'):
+					dash.left = dash.cache.format(dd.place, 'P{0:>3}')
+					dash.right = dash.cache.format(smm.numVehicles, ' {0:<3}')
+				# show completed laps and laps/time remaining
+				elif(page == 'remaining'):
+					dash.left = dash.cache.format(dd.totalLaps, 'L{0:>3}')
+					if(smm.maxLaps > 0 and smm.maxLaps < 2000):
+						dash.right = dash.cache.format(smm.maxLaps, ' {0:<3}')
+					elif(smm.endET > 0):
+						dash.right = dash.cache.format(divmod(round(smm.endET - smm.currentET, 1), 60), '{0:02.0f}.{1:04.1f}')
+					else:
+						dash.right = ' '*4
+				# show tire temperatures
+				elif(page == 'tires'):
+					tires.show(dash)
+				# show fuel to add and laps of fuel left
+				elif(page == 'fuel'):
+					fuel.show(dash)
 				# blink red status LED at critical fuel level
-				if(settings['fuel']['enabled'] and samples['avg_fuel'] > 0 and smm.fuel/samples['avg_fuel'] <= settings['fuel']['warning']):
+				if(settings['fuel']['enabled'] and fuel.avg > 0 and smm.fuel/fuel.avg <= settings['fuel']['warning']):
 					status[0] = '1'
-					if(smm.fuel/samples['avg_fuel'] < settings['fuel']['critical']):
-						if(settings['led_blink']['enabled'] and time() - blink_time['led'] <= settings['led_blink']['duration']):
-							status[0] = '0'
-						else:
-							status[0] = '1'
-						if(settings['text_blink']['enabled'] and time() - blink_time['text'] <= settings['text_blink']['duration']):
+					if(smm.fuel/fuel.avg < settings['fuel']['critical']):
+						box.trigger('fuel', now)
+						status[0] = anim['led']
+						if(anim['text']):
 							dash.left = 'fuel'
 				# blink yellow status LED at critical oil/coolant temp
 				if(settings['temperature']['enabled'] and smm.overheating):
-					if(settings['led_blink']['enabled'] and time() - blink_time['led'] <= settings['led_blink']['duration']):
-						status[1] = '0'
-					else:
-						status[1] = '1'
-					if(settings['text_blink']['enabled'] and time() - blink_time['text'] <= settings['text_blink']['duration']):
+					box.trigger('heat', now)
+					status[1] = anim['led']
+					if(anim['text']):
 						dash.left = 'heat'
+				# yellow status LED for tire temperatures away from baseline, blinks when critical
+				if(tires.level == 2):
+					box.trigger('tires', now)
+					status[1] = anim['led']
+				elif(tires.level == 1 and status[1] == '0'):
+					status[1] = '1'
 				# blink green status LED while in pit/limiter active
 				if(smm.yellowFlagState == rfYellowFlagState.pitOpen):
 					status[3] = '1'
 				if(dd.inPits):
-					if(settings['led_blink']['enabled'] and time() - blink_time['led'] <= settings['led_blink']['duration']):
-						status[3] = '0'
-					else:
-						status[3] = '1'
-					if(settings['text_blink']['enabled'] and time() - blink_time['text'] <= settings['text_blink']['duration']):
+					status[3] = anim['led']
+					if(anim['text']):
 						dash.right = 'pit '
+			# republish the normalized snapshot for other tools, keep some of it for the black box, lap statistics and recording
+			if(dd and (bus or laps.enabled or recorder.enabled or box.due(now))):
+				rf1_frame(smm, dd, frame)
+				frame.time = now
+				if(bus):
+					bus.publish(frame)
+				box.add(now, frame)
+				laps.add(frame)
+				recorder.add(now, smm, frame)
+			t_hid = timer()
+			metrics.stage('logic', t_hid - t_logic)
+			if(not sched.render_due()):
+				continue
 			# make sure engine is running
 			if(dd and smm.engineRPM > 1):
 				dash.status = ''.join(status)
-				dash.update()
+				sent = dash.update()
 			else:
-				dash.reset()
+				sent = dash.reset()
+			buttons.displayed(timer(), sent)
+			if(sent):
+				shift.sent(dash.write_time)
+			# with a sender thread 'sent' only means queued, the thread records the write itself
+			if(not dash.sender):
+				if(sent):
+					metrics.stage('hid', timer() - t_hid)
+					metrics.count('frames_sent')
+				else:
+					metrics.count('frames_skipped')
 	except:
 		log_print("Unhandled exception!")
 		log_print(format_exc())
+		if(box):
+			box.trigger('exception')
 	finally:
-		log_print("Closing shared memory map...")
-		rfMapHandle.close()
+		if(watch_task):
+			watch_task.cancel()
+		if(sched):
+			sched.close()
+		if(profiles):
+			profiles.save()
+		if(recorder):
+			recorder.close()
+		if(reader):
+			reader.close()
+		if(rfMapHandle):
+			log_print("Closing shared memory map...")
+			rfMapHandle.close()
 		log_print("-"*16 + " RF1 SHUTDOWN " + "-"*16)
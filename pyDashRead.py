@@ -0,0 +1,66 @@
+"""
+pyDashRead.py - Consistent snapshots of the sim shared memory
+by Dan Allongo (daniel.s.allongo@gmail.com)
+
+The sims write to the shared memory while pyDash reads it, so a copy can
+mix two updates. The reader notes each game's update counter (R3E player
+simulation ticks, rFactor delta/elapsed time) before and after copying
+and retries (up to 'retries' times) when it moved. Torn reads that were
+retried and frames that stayed torn are counted in pyDash metrics.
+
+Only the header and the active entries of the driver/vehicle array (as
+given by the count field in the header) are copied, into the same
+structure instance every time, rather than the whole mapping.
+
+Release History:
+2026-10-19: Initial release
+	Same interface as pyDashSplit.splitSource
+	Session fingerprint taken from the snapshot rather than the live mapping
+"""
+
+from ctypes import memmove, memset, addressof, sizeof
+from pyDashSession import field_span
+
+class snapshotReader:
+	def __init__(self, handle, struct, counters, array, count, metrics=None, retries=3):
+		self.handle = handle
+		self.metrics = metrics
+		self.retries = retries
+		self.smm = struct()
+		# identifying fields are fingerprinted from the snapshot (see pyDashSession), so they agree with self.smm
+		self.buffer = buffer(self.smm)
+		self.address = addressof(self.smm)
+		self.counters = [field_span(struct, c) for c in counters]
+		self.header = getattr(struct, array).offset
+		array_type = dict(struct._fields_)[array]
+		self.element = sizeof(array_type._type_)
+		self.max_count = array_type._length_
+		self.count_offset = getattr(struct, count).offset
+		self.count_type = dict(struct._fields_)[count]
+		self.size = self.header
+
+	def version(self):
+		return [self.handle[o:o + n] for o, n in self.counters]
+
+	# fills self.smm, returns False when the frame may still be torn after all retries
+	def read(self):
+		for i in xrange(self.retries + 1):
+			v = self.version()
+			n = min(max(self.count_type.from_buffer_copy(self.handle, self.count_offset).value, 0), self.max_count)
+			size = self.header + n*self.element
+			memmove(self.address, self.handle[0:size], size)
+			# clear entries left over from a bigger field
+			if(size < self.size):
+				memset(self.address + size, 0, self.size - size)
+			self.size = size
+			if(self.version() == v):
+				return True
+			if(self.metrics):
+				self.metrics.count('torn_reads')
+		if(self.metrics):
+			self.metrics.count('torn_frames')
+		return False
+
+	# nothing to release, the game loop closes the mapping
+	def close(self):
+		return
@@ -0,0 +1,235 @@
+"""
+pyDashRec.py - Telemetry recording file format for pyDash
+by Dan Allongo (daniel.s.allongo@gmail.com)
+
+A recording is a 64 byte header followed by fixed-size records, each one
+a frame timestamp (double, seconds) and the raw bytes of one ctypes
+structure (normalized dashFrame or a whole sim structure).
+
+Header (little endian):
+magic: 4 bytes, 'PDRC'
+version: uint16
+header size: uint16, always 64
+frame size: uint32, size of the ctypes structure
+frame count: uint32, written on close (0 if the recording was not closed, use the file size)
+started: double, unix time of the first frame
+struct: 32 bytes, name of the ctypes structure (see 'structs')
+
+With settings['record'] enabled, the game loops record the raw sim
+structure at 'rate' frames per second to pyDash.<game>.<date>-<time>.rec,
+a new recording is started for each session. While recording, lap starts,
+sector crossings and pit entries are appended to an index next to it (.idx,
+one JSON object per line: kind, key, frame). Since every session change
+starts a new file, the only 'session' entry is frame 0 of each recording
+(key is the session type). Records are fixed-size, so recordingReader can
+go straight to the first frame of any indexed event (ie, seek('sector', '37.2')).
+
+Release History:
+2026-10-19: Initial release
+	Session recorder with lap/sector/pit/session index, memory-mapped reader
+	Sector 1 is indexed with the lap start
+"""
+
+from struct import Struct
+from ctypes import sizeof
+from time import time, strftime, localtime
+from mmap import mmap, ACCESS_READ
+from os.path import exists
+import json
+
+header = Struct('<4sHHIId32s8x')
+stamp = Struct('<d')
+magic = 'PDRC'
+version = 1
+
+# structure name -> (module, class), imported when a recording of that type is opened
+structs = {'dashFrame':('pyDashBus', 'dashFrame'),
+	'r3e_shared':('pyR3E', 'r3e_shared'),
+	'rfShared':('pyRF1', 'rfShared')}
+
+def struct_type(name):
+	module, cls = structs[name]
+	return getattr(__import__(module), cls)
+
+def read_header(f):
+	f.seek(0)
+	m, v, hs, frame_size, count, started, name = header.unpack(f.read(header.size))
+	if(m != magic):
+		raise ValueError("{0} is not a pyDash recording".format(f.name))
+	return {'version':v, 'header_size':hs, 'frame_size':frame_size, 'record_size':stamp.size + frame_size,
+		'count':count, 'started':started, 'struct':name.rstrip('\0')}
+
+class recordingWriter:
+	def __init__(self, fn, frame_type, started=None):
+		self.fn = fn
+		self.frame_size = sizeof(frame_type)
+		self.struct = frame_type.__name__
+		self.started = started or time()
+		self.count = 0
+		self.f = open(fn, 'wb')
+		self.write_header()
+
+	def write_header(self):
+		self.f.seek(0)
+		self.f.write(header.pack(magic, version, header.size, self.frame_size, self.count, self.started, self.struct))
+		return
+
+	def write(self, t, frame):
+		self.f.write(stamp.pack(t) + buffer(frame)[:])
+		self.count += 1
+		return
+
+	# records already packed as timestamp + frame bytes
+	def write_records(self, data, count):
+		self.f.write(data)
+		self.count += count
+		return
+
+	def close(self):
+		self.write_header()
+		self.f.close()
+		return
+
+# raw sim structures at a reduced rate, events are taken from the normalized frame (pyDashBus.dashFrame)
+class sessionRecorder:
+	def __init__(self, prefix, game, settings, log_print=None):
+		self.prefix = prefix
+		self.game = game
+		self.log_print = log_print
+		self.writer = None
+		self.index = None
+		self.next_sample = 0
+		self.configure(settings)
+
+	def configure(self, settings):
+		self.enabled = settings['record']['enabled']
+		self.period = 1.0/settings['record']['rate']
+		if(not self.enabled):
+			self.close()
+		return
+
+	def open(self, frame_type):
+		name = '{0}.{1}.{2}'.format(self.prefix, self.game, strftime('%Y%m%d-%H%M%S', localtime()))
+		fn = name + '.rec'
+		n = 1
+		while(exists(fn)):
+			n += 1
+			fn = '{0}-{1}.rec'.format(name, n)
+		self.writer = recordingWriter(fn, frame_type)
+		self.index = open(fn[:-4] + '.idx', 'w')
+		self.started = None
+		self.pits = 0
+		self.lap = None
+		self.sector = None
+		self.in_pits = 0
+		if(self.log_print):
+			self.log_print("Recording to {0}".format(fn))
+		return
+
+	def close(self):
+		if(self.writer):
+			self.writer.close()
+			self.index.close()
+			self.writer = None
+			self.index = None
+		return
+
+	def mark(self, kind, key):
+		self.index.write(json.dumps({'kind':kind, 'key':str(key), 'frame':self.writer.count}) + '\n')
+		self.index.flush()
+		return
+
+	# new session detected by the game loop, the next frame starts a new recording
+	def session(self):
+		self.close()
+		return
+
+	def add(self, now, smm, f):
+		if(not self.enabled):
+			return
+		# events point at the next frame to be recorded
+		if(not self.writer):
+			self.open(type(smm))
+			self.mark('session', f.session)
+		if(f.completed_laps != self.lap):
+			first = self.lap is None
+			self.lap = f.completed_laps
+			self.mark('lap', self.lap + 1)
+			# sector 1 starts with the lap, sims do not always change sector and lap count on the same sample
+			if(not first or f.sector == 1):
+				self.mark('sector', '{0}.1'.format(self.lap + 1))
+		if(f.sector != self.sector):
+			self.sector = f.sector
+			if(self.sector != 1):
+				self.mark('sector', '{0}.{1}'.format(self.lap + 1, self.sector))
+		if(f.in_pits and not self.in_pits):
+			self.pits += 1
+			self.mark('pit', self.pits)
+		self.in_pits = f.in_pits
+		if(now < self.next_sample):
+			return
+		self.next_sample = now + self.period
+		if(self.started is None):
+			self.started = now
+			self.writer.started = time()
+		self.writer.write(now - self.started, smm)
+		return
+
+class recordingReader:
+	def __init__(self, fn):
+		self.fn = fn
+		self.f = open(fn, 'rb')
+		h = read_header(self.f)
+		self.header = h
+		self.frame_type = struct_type(h['struct'])
+		self.record_size = h['record_size']
+		self.map = mmap(self.f.fileno(), 0, access=ACCESS_READ)
+		# count from the size, recordings that were not closed have 0 in the header
+		self.count = (len(self.map) - h['header_size'])/self.record_size
+		self.index = None
+
+	def __len__(self):
+		return self.count
+
+	def offset(self, i):
+		return self.header['header_size'] + i*self.record_size
+
+	def time(self, i):
+		return stamp.unpack_from(self.map, self.offset(i))[0]
+
+	def frame(self, i):
+		o = self.offset(i)
+		return stamp.unpack_from(self.map, o)[0], self.frame_type.from_buffer_copy(self.map, o + stamp.size)
+
+	def frames(self, start=0, stop=None):
+		for i in xrange(start, self.count if stop is None else min(stop, self.count)):
+			yield self.frame(i)
+
+	# {kind:{key:frame}} from the .idx file, first occurrence of each key
+	def load_index(self):
+		self.index = {}
+		try:
+			with open(self.fn[:-4] + '.idx', 'r') as f:
+				for line in f:
+					try:
+						e = json.loads(line)
+					except ValueError:
+						continue
+					self.index.setdefault(e['kind'], {}).setdefault(e['key'], e['frame'])
+		except IOError:
+			pass
+		return self.index
+
+	# frame number of an indexed event (ie, seek('lap', 37)), None if it is not in the recording
+	def seek(self, kind, key):
+		if(self.index is None):
+			self.load_index()
+		i = self.index.get(kind, {}).get(str(key))
+		if(i is None or i >= self.count):
+			return None
+		return i
+
+	def close(self):
+		self.map.close()
+		self.f.close()
+		return
@@ -0,0 +1,73 @@
+"""
+pyDashSched.py - Fixed-rate frame scheduler for the pyDash game loops
+by Dan Allongo (daniel.s.allongo@gmail.com)
+
+Telemetry is sampled at one rate and the display is rendered at another.
+Deadlines are absolute (next = previous + period) so loop work and sleep
+overshoot do not accumulate into drift. The last 'spin' seconds before each
+deadline are busy-waited for a consistent cadence, set it to 0 to only sleep.
+When the loop falls more than a full period behind the missed deadlines are
+counted and skipped rather than run back-to-back.
+
+Release History:
+2026-10-19: Initial release
+"""
+
+from time import sleep
+from sys import platform
+from pyDashMetrics import timer
+if(platform == 'win32'):
+	from ctypes import windll
+
+class frameScheduler:
+	def __init__(self, timing, metrics=None):
+		self.metrics = metrics
+		self.now = 0
+		self.next_sample = 0
+		self.next_render = 0
+		self.configure(timing)
+		# ask for 1 ms timer resolution, default Windows sleep granularity is 15.6 ms
+		if(platform == 'win32'):
+			windll.winmm.timeBeginPeriod(1)
+
+	def configure(self, timing):
+		self.sample_period = 1.0/timing['sample_rate']
+		self.render_period = 1.0/min(timing['render_rate'], timing['sample_rate'])
+		self.spin = timing['spin']
+		return
+
+	def close(self):
+		if(platform == 'win32'):
+			windll.winmm.timeEndPeriod(1)
+		return
+
+	# block until the next sample deadline, returns the frame timestamp
+	def wait(self):
+		now = timer()
+		if(self.next_sample == 0):
+			self.next_sample = now
+			self.next_render = now
+		else:
+			self.next_sample += self.sample_period
+			late = now - self.next_sample
+			if(late > self.sample_period):
+				missed = int(late/self.sample_period)
+				self.next_sample += missed*self.sample_period
+				if(self.metrics):
+					self.metrics.count('missed_deadlines', missed)
+			remaining = self.next_sample - now
+			if(remaining > self.spin):
+				sleep(remaining - self.spin)
+			while(timer() < self.next_sample):
+				pass
+		self.now = timer()
+		return self.now
+
+	# true once per render period, checked after the sample has been processed
+	def render_due(self):
+		if(self.now < self.next_render):
+			return False
+		self.next_render += self.render_period
+		if(self.now - self.next_render > self.render_period):
+			self.next_render = self.now + self.render_period
+		return True
@@ -0,0 +1,62 @@
+"""
+pyDashSession.py - Session change detection from the raw shared memory bytes
+by Dan Allongo (daniel.s.allongo@gmail.com)
+
+The fields that identify a session (session type, track, layout, vehicle)
+are located once in the shared memory structure by their ctypes offsets.
+Each sample hashes just those bytes straight from the snapshot buffer and
+compares the result with the previous one, the strings themselves are only
+decoded (for logging and metrics) when the fingerprint changes.
+
+Release History:
+2026-10-19: Initial release
+"""
+
+# (offset, size) in bytes of the field at attribute path 'path' (ie, 'track_info.track_id') of a ctypes structure
+def field_span(struct, path):
+	cls = struct
+	offset = 0
+	for name in path.split('.'):
+		f = getattr(cls, name)
+		offset += f.offset
+		size = f.size
+		cls = dict(cls._fields_)[name]
+	return offset, size
+
+class sessionFingerprint:
+	# 'fields' are attribute paths into 'struct'
+	def __init__(self, struct, fields):
+		self.fields = fields
+		spans = [field_span(struct, path) for path in fields]
+		# merge neighbouring fields into a single slice
+		spans.sort()
+		self.spans = []
+		for o, n in spans:
+			if(self.spans and self.spans[-1][0] + self.spans[-1][1] >= o):
+				po, pn = self.spans[-1]
+				self.spans[-1] = (po, max(pn, o + n - po))
+			else:
+				self.spans.append((o, n))
+		self.reset()
+
+	def reset(self):
+		self.fingerprint = None
+		return
+
+	# true when the identifying bytes in 'buf' (the reader's snapshot buffer) differ from the last call
+	def changed(self, buf):
+		fp = hash(''.join([buf[o:o + n] for o, n in self.spans]))
+		if(fp == self.fingerprint):
+			return False
+		self.fingerprint = fp
+		return True
+
+	# identifying values decoded from the structure copy, only needed after a change
+	def decode(self, smm):
+		o = []
+		for path in self.fields:
+			v = smm
+			for name in path.split('.'):
+				v = getattr(v, name)
+			o.append(v)
+		return o
@@ -0,0 +1,76 @@
+"""
+pyDashShift.py - Predictive shift light and RPM smoothing for pyDash
+by Dan Allongo (daniel.s.allongo@gmail.com)
+
+The shift light is otherwise late by however long it takes the sample to
+reach the display (wait for the next render, HID write, display refresh).
+The rate of change of RPM is estimated with a least squares fit over the
+last few samples and the shift point is tested against the RPM expected
+once the frame is actually visible. The lead time is the average wait for
+the next render plus the measured HID write time plus settings['rpm']['latency'].
+
+The RPM bar can optionally be smoothed with an exponential moving average
+('smoothing' of 0 disables it), the shift light always uses the raw value.
+
+Release History:
+2026-10-19: Initial release
+"""
+
+from collections import deque
+
+class shiftPredictor:
+	# samples used for the rate estimate
+	history = 5
+
+	def __init__(self, settings):
+		self.write_time = 0
+		self.configure(settings)
+		self.reset()
+
+	def configure(self, settings):
+		self.settings = settings['rpm']
+		# on average a sample waits half a render period before it is sent
+		self.render_wait = 0.5/min(settings['timing']['render_rate'], settings['timing']['sample_rate'])
+		return
+
+	def reset(self):
+		self.samples = deque(maxlen=self.history)
+		self.rate = 0
+		self.value = 0
+		self.smoothed = None
+		self.predicted = 0
+		return
+
+	# HID write time for the last frame sent, averaged into the lead time
+	def sent(self, dt):
+		self.write_time += (dt - self.write_time)*0.1
+		return
+
+	def lead(self):
+		return self.render_wait + self.write_time + self.settings['latency']
+
+	# 'value' is the fraction of max RPM
+	def update(self, now, value):
+		self.value = value
+		self.samples.append((now, value))
+		n = len(self.samples)
+		self.rate = 0
+		if(n > 2):
+			mt = sum([t for t, v in self.samples])/n
+			mv = sum([v for t, v in self.samples])/n
+			d = sum([(t - mt)**2 for t, v in self.samples])
+			if(d > 0):
+				self.rate = sum([(t - mt)*(v - mv) for t, v in self.samples])/d
+		# only look ahead while RPM is climbing, upshifts and lifting show immediately
+		if(self.settings['predict'] and self.rate > 0):
+			self.predicted = value + self.rate*self.lead()
+		else:
+			self.predicted = value
+		if(self.smoothed is None or not self.settings['smoothing']):
+			self.smoothed = value
+		else:
+			self.smoothed += (value - self.smoothed)*(1 - self.settings['smoothing'])
+		return
+
+	def shift(self, point):
+		return self.predicted >= point
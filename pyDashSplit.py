@@ -0,0 +1,80 @@
+"""
+pyDashSplit.py - Samples the sim shared memory in a separate process
+by Dan Allongo (daniel.s.allongo@gmail.com)
+
+With settings['timing']['split'] enabled, a reader process copies the sim
+shared memory (through snapshotReader) at the sample rate and publishes
+every snapshot into a telemetryRing (see pyDashBus). The game loop in the
+main process runs the dash logic and SRD-9c output against the newest
+complete snapshot in the ring, so sampling keeps its own cadence on
+another core regardless of rendering, logging or HID stalls.
+
+The ring never blocks the reader, a slow renderer simply skips to the
+newest frame (skipped frames are counted as 'frames_superseded').
+
+Release History:
+2026-10-19: Initial release
+"""
+
+from multiprocessing import Process, Event
+from mmap import mmap
+from ctypes import sizeof
+from os import getpid
+from pyDashRead import snapshotReader
+from pyDashBus import telemetryRing
+from pyDashSched import frameScheduler
+
+# reader process, the ring has already been created by splitSource
+def sample(struct, tagname, counters, array, count, name, timing, stop):
+	handle = mmap(fileno=0, length=sizeof(struct), tagname=tagname)
+	reader = snapshotReader(handle, struct, counters, array, count)
+	ring = telemetryRing(name, struct)
+	sched = frameScheduler(timing)
+	try:
+		while(not stop.is_set()):
+			sched.wait()
+			reader.read()
+			ring.publish(reader.smm)
+	finally:
+		sched.close()
+		ring.close()
+		handle.close()
+	return
+
+# same interface as snapshotReader for the game loops
+class splitSource:
+	def __init__(self, struct, tagname, counters, array, count, timing, metrics=None, log_print=None, slots=8):
+		self.metrics = metrics
+		self.log_print = log_print
+		self.smm = struct()
+		self.buffer = buffer(self.smm)
+		self.seq = 0
+		self.warned = False
+		name = 'pyDashSplit.{0}'.format(getpid())
+		self.ring = telemetryRing(name, struct, slots, writer=True)
+		self.stop = Event()
+		self.process = Process(target=sample, args=(struct, tagname, counters, array, count, name, timing, self.stop), name='pyDashReader')
+		self.process.daemon = True
+		self.process.start()
+
+	# True when a new snapshot was copied into self.smm
+	def read(self):
+		seq = self.ring.latest(self.smm)
+		if(not seq or seq == self.seq):
+			if(not self.warned and not self.process.is_alive()):
+				if(self.log_print):
+					self.log_print("Reader process exited with code {0}".format(self.process.exitcode))
+				self.warned = True
+			return False
+		if(self.metrics and self.seq and seq - self.seq > 1):
+			self.metrics.count('frames_superseded', seq - self.seq - 1)
+		self.seq = seq
+		return True
+
+	def close(self):
+		self.stop.set()
+		self.process.join(1)
+		if(self.process.is_alive()):
+			self.process.terminate()
+		self.ring.close()
+		return
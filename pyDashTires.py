@@ -0,0 +1,143 @@
+"""
+pyDashTires.py - Tire temperature and pressure monitor for pyDash
+by Dan Allongo (daniel.s.allongo@gmail.com)
+
+Tire data is copied out of the shared memory block as flat float arrays
+(12 tread temperatures, 4 pressures) and analysed in a single pass at a
+reduced rate (settings['tires']['rate'] times per second). The game loops
+only read the cached results between samples.
+
+For each corner the monitor keeps the average tread temperature and its
+deviation from a baseline, the inner minus outer spread across the tread
+and the pressure deviation from a baseline. Both baselines are learned over
+'baseline' seconds once the tires are warm (the first lap has been completed
+or the average temperature has levelled off), so the normal warm-up on the
+out lap is not reported as overheating. The warning level and the corner
+shown on the info page come from whichever of the three is furthest past
+its warning threshold.
+
+Release History:
+2026-10-19: Initial release
+	Baseline is learned once the tires are warm
+	Warnings for inner/outer spread and pressure deviation
+"""
+
+from ctypes import c_float
+
+corners = ['FL', 'FR', 'RL', 'RR']
+
+# tires count as warm when the average temperature changes less than this (C) over the period (s)
+plateau_change = 2.0
+plateau_period = 30.0
+
+# flat [FL left, FL center, FL right, FR left, ...] temperatures and [FL, FR, RL, RR] pressures
+def r3e_tires(smm):
+	return list((c_float*12).from_buffer_copy(smm.tire_temps)), list((c_float*4).from_buffer_copy(smm.tire_pressure))
+
+def rf1_tires(smm):
+	temps = []
+	for w in smm.wheel:
+		temps += w.temperature
+	return temps, [w.pressure for w in smm.wheel]
+
+class tireMonitor:
+	def __init__(self, settings):
+		self.configure(settings)
+		self.reset()
+
+	def configure(self, settings):
+		self.settings = settings['tires']
+		self.period = 1.0/self.settings['rate']
+		return
+
+	def reset(self):
+		self.next_sample = 0
+		self.first_lap = None
+		self.plateau_temp = None
+		self.plateau_until = 0
+		self.learn_until = 0
+		self.learned = 0
+		self.baseline = None
+		self.baseline_pressure = None
+		self.sums = [0.0]*8
+		self.temp = [0.0]*4
+		self.spread = [0.0]*4
+		self.pressure = [0.0]*4
+		self.deviation = [0.0]*4
+		self.pressure_deviation = [0.0]*4
+		self.worst = 0
+		# 'T' temperature, 'S' spread or 'P' pressure of the worst corner
+		self.worst_kind = 'T'
+		# 0 = normal, 1 = warning, 2 = critical
+		self.level = 0
+		return
+
+	def due(self, now):
+		return self.settings['enabled'] and now >= self.next_sample
+
+	# a completed lap or a levelled off average temperature
+	def warm(self, now, laps):
+		if(self.first_lap is None):
+			self.first_lap = laps
+		if(laps > self.first_lap):
+			return True
+		if(now >= self.plateau_until):
+			avg = sum(self.temp)/4.0
+			if(self.plateau_temp is not None and abs(avg - self.plateau_temp) < plateau_change):
+				return True
+			self.plateau_temp = avg
+			self.plateau_until = now + plateau_period
+		return False
+
+	# 'laps' is the number of completed laps, returns True when the baseline has just been learned
+	def update(self, now, temps, pressures, laps):
+		self.next_sample = now + self.period
+		# corner averages and inner - outer spread (outside of the tread is on the left for left side tires)
+		self.temp = [(temps[i] + temps[i + 1] + temps[i + 2])/3.0 for i in (0, 3, 6, 9)]
+		self.spread = [temps[2] - temps[0], temps[3] - temps[5], temps[8] - temps[6], temps[9] - temps[11]]
+		self.pressure = list(pressures)
+		if(self.baseline is None):
+			# ignore samples until the tires report something and have warmed up
+			if(max(self.temp) <= 0):
+				return False
+			if(not self.learn_until):
+				if(not self.warm(now, laps)):
+					return False
+				self.learn_until = now + self.settings['baseline']
+			self.sums = [a + b for a, b in zip(self.sums, self.temp + self.pressure)]
+			self.learned += 1
+			if(now < self.learn_until):
+				return False
+			self.baseline = [s/float(self.learned) for s in self.sums[:4]]
+			self.baseline_pressure = [s/float(self.learned) for s in self.sums[4:]]
+			return True
+		self.deviation = [t - b for t, b in zip(self.temp, self.baseline)]
+		self.pressure_deviation = [p - b for p, b in zip(self.pressure, self.baseline_pressure)]
+		# (kind, values, warning, critical), spread and pressure are critical at twice their warning
+		s = self.settings
+		checks = [('T', self.deviation, s['warning'], s['critical']),
+			('S', self.spread, s['spread'], s['spread']*2),
+			('P', self.pressure_deviation, s['pressure'], s['pressure']*2)]
+		# worst corner of any kind by how far it is into its warning threshold
+		ratio, self.worst_kind, self.worst, warning, critical = max([(abs(v[i])/w, k, i, w, c) for k, v, w, c in checks for i in xrange(4)])
+		d = ratio*warning
+		if(d >= critical):
+			self.level = 2
+		elif(d >= warning):
+			self.level = 1
+		else:
+			self.level = 0
+		return False
+
+	def values(self, kind):
+		return {'T':self.deviation, 'S':self.spread, 'P':self.pressure_deviation}[kind]
+
+	# info page: kind and worst corner on the left, its value (or the hottest average until learned) on the right
+	def show(self, dash):
+		if(self.baseline is None):
+			dash.left = dash.cache.format(corners[self.temp.index(max(self.temp))], 'T {0}')
+			dash.right = dash.cache.format(round(max(self.temp)), '{0:.0f}')
+		else:
+			dash.left = dash.cache.format((self.worst_kind, corners[self.worst]), '{0} {1}')
+			dash.right = dash.cache.format(round(self.values(self.worst_kind)[self.worst], 1), '{0:+.1f}')
+		return
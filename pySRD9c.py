@@ -16,7 +16,24 @@ blue/status LEDs: 1 byte, the four low bits are the blue RPM LEDs, the four high
 gear display: 1 byte, each bit is a single segment of the display in the standard order (1 digit)
 padding/unknown: 29 bytes, all 0 during normal operation, setting all bytes to 0xff resets the device
 
+Input reports are delivered by pywinusb on its own reader thread. Only the first 'button_bytes'
+bytes after the report id are buttons (buttons 0-63, one bit each), anything after them (axes)
+is ignored. Each press (bit going from 0 to 1) is appended to the 'events' deque as
+(button number, timestamp) for the application to consume whenever it is ready.
+
+The connection is managed on a background thread. A failed write marks the device as
+disconnected and starts the reconnect thread, update() keeps packing reports but only the
+latest one is kept until the device is back, then it is sent in full. A hardware reset
+works the same way, so the caller is never blocked waiting for the device. Reports are
+only ever packed by the caller, the connection thread resends the last one packed.
+
 Release History:
+2026-10-19: Skip HID write when the packed report has not changed
+	Added LRU cache for formatted values and their segment encoding
+	Button presses from the input report queued as events
+	Reconnect on a background thread after write failures and hardware reset
+	HID writes can be handed to a worker thread
+	Input limited to the button bytes, press to display time measured after threaded writes
 2016-05-07: Added wait time on hardware reset
 2016-05-05: Added raw hardware tests
 2016-05-04: Added sanity checks, helper functions, friendlier LED handling
@@ -24,7 +41,65 @@ Release History:
 """
 
 from pywinusb import hid
-from time import sleep
+from time import sleep, time, clock
+from sys import platform
+from collections import OrderedDict, deque
+from threading import Thread, Event, Lock
+
+# time.clock() is the high resolution wall clock on Windows only
+if(platform == 'win32'):
+	timer = clock
+else:
+	timer = time
+
+# display text that carries its pre-encoded segments, used as-is by pack_report
+class segText(str):
+	pass
+
+# bounded LRU cache of (value, format, width) -> segText and (text, width) -> segments
+class segmentCache:
+	def __init__(self, encoder, size=1024):
+		self.encoder = encoder
+		self.size = size
+		self.formats = OrderedDict()
+		self.strings = OrderedDict()
+		self.stats = {'hits':0, 'misses':0, 'size':0}
+
+	def lookup(self, d, key):
+		v = d.pop(key, None)
+		if(v is None):
+			self.stats['misses'] += 1
+			return None
+		d[key] = v
+		self.stats['hits'] += 1
+		return v
+
+	def store(self, d, key, v):
+		d[key] = v
+		if(len(d) > self.size):
+			d.popitem(last=False)
+		self.stats['size'] = len(self.formats) + len(self.strings)
+		return v
+
+	# value should already be rounded to display resolution, tuples are expanded into the format
+	def format(self, value, fmt, width=4):
+		key = (value, fmt, width)
+		v = self.lookup(self.formats, key)
+		if(v is None):
+			if(isinstance(value, tuple)):
+				v = segText(fmt.format(*value))
+			else:
+				v = segText(fmt.format(value))
+			v.segments = self.encoder(v, width)
+			self.store(self.formats, key, v)
+		return v
+
+	def segments(self, s, width=4):
+		key = (s, width)
+		v = self.lookup(self.strings, key)
+		if(v is None):
+			v = self.store(self.strings, key, self.encoder(s, width))
+		return v
 
 class srd9c:
 	lut = {
@@ -68,9 +143,30 @@ class srd9c:
 	 '.':int('10000000', 2)
 	}
 
-	def __init__(self, init_left='-'*4, init_right='-'*4, init_gear='-', use_green=True, use_red=True, use_blue=True, use_status=False):
+	# bytes of button bits at the start of the input report, after the report id
+	button_bytes = 8
+
+	def __init__(self, init_left='-'*4, init_right='-'*4, init_gear='-', use_green=True, use_red=True, use_blue=True, use_status=False, wait=True):
 		self.device = None
 		self.output_report = None
+		self.last_report = None
+		# latest report packed while the device is away, sent once it is back
+		self.frame = None
+		# last report packed by the caller, resent in full after a reconnect or hardware reset
+		self.packed = None
+		self.lock = Lock()
+		self.connected = Event()
+		self.connector = None
+		self.stats = {'connected':False, 'reconnects':0, 'write_errors':0, 'frames_dropped':0}
+		# optional worker (ie, pyDashLoop.latestWorker) for the HID writes, last report handed to it
+		self.sender = None
+		self.queued = None
+		self.write_time = 0
+		# optional dashMetrics, threaded writes are timed and counted where they happen
+		self.metrics = None
+		# (press time, first report number that shows it) waiting for a threaded write, see pressed()
+		self.presses = []
+		self.seq = 0
 		self.left = init_left
 		self.right = init_right
 		self.gear = init_gear
@@ -78,15 +174,92 @@ class srd9c:
 			'use_green':use_green, 'use_red':use_red, 'use_blue':use_blue, 'use_status':use_status,
 			'value':0}
 		self.status = '0'*4
-		while(not self.device):
-			devlist = hid.HidDeviceFilter(vendor_id = 0x04d8, product_id = 0xf667).get_devices()
-			if(devlist):
-				self.device = devlist[0]
-				self.device.open()
-				self.output_report = self.device.find_output_reports()[0]
-			else:
-				sleep(1)
-		self.update()
+		self.cache = segmentCache(self.string_to_display)
+		self.events = deque(maxlen=64)
+		self.last_input = None
+		self.packed = self.pack_report()
+		self.reconnect()
+		if(wait):
+			self.connected.wait()
+		return
+
+	# start the connection thread unless it is already running, 'delay' gives the device time to reset
+	def reconnect(self, delay=0, counted=False):
+		with self.lock:
+			if(self.connector):
+				return
+			self.connector = Thread(target=self.connect, args=(delay,), name='srd9c')
+			self.connector.daemon = True
+			self.connector.start()
+			if(counted):
+				self.stats['reconnects'] += 1
+		return
+
+	def connect(self, delay):
+		sleep(delay)
+		while(True):
+			device = None
+			try:
+				devlist = hid.HidDeviceFilter(vendor_id = 0x04d8, product_id = 0xf667).get_devices()
+				if(devlist):
+					device = devlist[0]
+					device.open()
+					# input handler is registered again on every open
+					device.set_raw_data_handler(self.input_handler)
+					with self.lock:
+						self.device = device
+						self.output_report = device.find_output_reports()[0]
+						self.last_input = None
+						# resend full state, the device comes back blank
+						report = self.frame or self.packed
+						self.frame = None
+						self.output_report.send(report)
+						self.last_report = report
+						self.connected.set()
+						self.stats['connected'] = True
+						self.connector = None
+					return
+			except:
+				self.close()
+				if(device):
+					try:
+						device.close()
+					except:
+						pass
+			sleep(1)
+
+	def close(self):
+		with self.lock:
+			self.connected.clear()
+			self.stats['connected'] = False
+			self.output_report = None
+			device, self.device = self.device, None
+		if(device):
+			try:
+				device.close()
+			except:
+				pass
+		return
+
+	def disconnected(self, delay=0):
+		self.close()
+		self.reconnect(delay, True)
+		return
+
+	# called on the pywinusb reader thread, keep it short
+	def input_handler(self, data):
+		t = timer()
+		buttons = data[1:1 + self.button_bytes]
+		if(self.last_input):
+			for i in xrange(min(len(buttons), len(self.last_input))):
+				pressed = buttons[i] & ~self.last_input[i]
+				b = i*8
+				while(pressed):
+					if(pressed & 1):
+						self.events.append((b, t))
+					pressed >>= 1
+					b += 1
+		self.last_input = buttons
 		return
 
 	def string_to_display(self, s='-'*4, l=4):
@@ -108,6 +281,12 @@ class srd9c:
 			o.append(c)
 		return o
 
+	# use segments already attached by segmentCache.format, otherwise the cached encoding
+	def encode(self, s, l=4):
+		if(isinstance(s, segText) and len(s.segments) == l):
+			return s.segments
+		return self.cache.segments(s, l)
+
 	def string_to_led(self, s='0'*4):
 		return ''.join([i for i in s if i in ['0', '1']]).rjust(4, '0')[3::-1]
 
@@ -134,22 +313,94 @@ class srd9c:
 	def pack_report(self):
 		self.calc_leds()
 		o = [0]
-		o += self.string_to_display(self.left, 4)
-		o += self.string_to_display(self.right, 4)
+		o += self.encode(self.left, 4)
+		o += self.encode(self.right, 4)
 		o += [int(self.string_to_led(self.rpm['red']) + self.string_to_led(self.rpm['green']), 2)]
 		o += [int(self.string_to_led(self.status) + self.string_to_led(self.rpm['blue']), 2)]
-		o += self.string_to_display(self.gear, 1)
+		o += self.encode(self.gear, 1)
 		o += [0]*(41 - len(o))
 		return o
 
-	def update(self):
-		self.output_report.send(self.pack_report())
+	# a handled button press (see pyDashInput) shows from the next packed report on,
+	# with a 'sender' its press to display time is recorded once that report is written
+	def pressed(self, t):
+		with self.lock:
+			self.presses.append((t, self.seq + 1))
 		return
 
+	# the report is always packed by the caller, only the write goes to the 'sender' worker when set
+	def update(self):
+		report = self.pack_report()
+		self.packed = report
+		if(self.sender):
+			if(report == self.queued):
+				# presses that did not change the display are not measured
+				with self.lock:
+					self.presses = [p for p in self.presses if p[1] <= self.seq]
+				if(self.metrics):
+					self.metrics.count('frames_skipped')
+				return False
+			self.queued = report
+			self.seq += 1
+			self.sender.submit(self.send_queued, report, self.seq)
+			return True
+		return self.send(report)
+
+	# runs on the sender thread, reports replaced before they were written are counted by the worker
+	# (a newer report shows the same presses)
+	def send_queued(self, report, seq=0):
+		t = timer()
+		sent = self.send(report)
+		written = timer()
+		with self.lock:
+			shown = [p for p, s in self.presses if s <= seq]
+			self.presses = [(p, s) for p, s in self.presses if s > seq]
+		if(self.metrics):
+			if(sent):
+				self.metrics.stage('hid', written - t)
+				self.metrics.count('frames_sent')
+				for p in shown:
+					self.metrics.stage('press_to_display', written - p)
+			else:
+				self.metrics.count('frames_skipped')
+		return sent
+
+	def send(self, report):
+		with self.lock:
+			if(not self.connected.is_set()):
+				# only the latest frame is kept while the device is away
+				if(self.frame and report != self.frame):
+					self.stats['frames_dropped'] += 1
+				self.frame = report
+				return False
+			# nothing changed on the display, skip the HID write
+			if(report == self.last_report):
+				return False
+			t = timer()
+			try:
+				sent = self.output_report.send(report)
+			except:
+				sent = False
+			self.write_time = timer() - t
+			if(sent is not False):
+				self.last_report = report
+				return True
+			self.frame = report
+			self.stats['write_errors'] += 1
+		self.disconnected()
+		return False
+
+	# device is unavailable for ~5 seconds, reconnects in the background
 	def hw_reset(self):
-		self.output_report.send([0] + [0xff]*40)
-		sleep(5)
-		self.__init__()
+		with self.lock:
+			if(self.connected.is_set()):
+				try:
+					self.output_report.send([0] + [0xff]*40)
+				except:
+					pass
+			self.last_report = None
+			self.queued = None
+		self.disconnected(5)
 		return
 
 	def hw_test(self):
@@ -171,8 +422,7 @@ class srd9c:
 		self.rpm['red'] = '0'*4
 		self.rpm['blue'] = '0'*4
 		self.status = '0'*4
-		self.update()
-		return
+		return self.update()
 
 	def self_test(self):
 		self.gear = '0'
@@ -201,5 +451,6 @@ if __name__ == '__main__':
 	sleep(3)
 	print "Beginning test cycle..."
 	test.hw_test()
+	test.connected.wait()
 	test.self_test()
 	print "Done!"
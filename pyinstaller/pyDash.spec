@@ -7,7 +7,7 @@ a = Analysis(['pyDash.py'],
              pathex=['C:\\'],
              binaries=None,
              datas=None,
-             hiddenimports=[],
+             hiddenimports=['pyDashR3E', 'pyDashRF1'],
              hookspath=[],
              runtime_hooks=[],
              excludes=[],